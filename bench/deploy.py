@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import json
+import os
+import resource
+import signal
+import socket
+import subprocess
+import sys
+import time
+from asyncio import StreamReader, StreamWriter
+from typing import List
+
+from server.framing import FRAME_HEADER, HEADER_SIZE, encode_frame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ACTIONS = ('CREATE', 'WRITE', 'START', 'QUERY', 'DELETE')
+
+
+class Session:
+    resource_name: str
+    requests: List[tuple[str, str, str]]
+    latencies: dict[str, List[int]]
+    failures: int
+    deployed_at: float
+
+    def __init__(self, resource_name: str, fb_count: int):
+        self.resource_name = resource_name
+        self.requests = generate_requests(resource_name, fb_count)
+        self.latencies = {action: [] for action in ACTIONS}
+        self.failures = 0
+        self.deployed_at = 0
+
+
+def request(request_id: int, action: str, body: str = '') -> str:
+    if body == '':
+        return f'<Request ID="{request_id}" Action="{action}"/>'
+
+    return f'<Request ID="{request_id}" Action="{action}">{body}</Request>'
+
+
+def generate_requests(resource_name: str, fb_count: int) -> List[tuple[str, str, str]]:
+    requests = []
+
+    def add(target: str, action: str, body: str = ''):
+        requests.append((target, action, request(len(requests) + 1, action, body)))
+
+    add('', 'CREATE', f'<FB Name="{resource_name}" Type="EMB_RES"/>')
+    add(resource_name, 'CREATE', '<FB Name="R" Type="E_RESTART"/>')
+
+    for i in range(fb_count - 1):
+        add(resource_name, 'CREATE', f'<FB Name="A{i}" Type="ADD_2"/>')
+
+    for i in range(fb_count - 1):
+        trigger = 'R.WARM' if i == 0 else f'A{i - 1}.CNF'
+        add(resource_name, 'CREATE', f'<Connection Source="{trigger}" Destination="A{i}.REQ"/>')
+
+        if i == 0:
+            add(resource_name, 'WRITE', f'<Connection Source="1" Destination="A{i}.IN1"/>')
+        else:
+            add(resource_name, 'CREATE', f'<Connection Source="A{i - 1}.OUT" Destination="A{i}.IN1"/>')
+
+        add(resource_name, 'WRITE', f'<Connection Source="1" Destination="A{i}.IN2"/>')
+
+    add(resource_name, 'START')
+    add(resource_name, 'QUERY', '<FB Name="R" Type="*"/>')
+    add('', 'QUERY', '<FB Name="*" Type="*"/>')
+    add('', 'DELETE', f'<FB Name="{resource_name}" Type="EMB_RES"/>')
+
+    return requests
+
+
+async def read_frame(reader: StreamReader) -> bytes:
+    _, length = FRAME_HEADER.unpack(await reader.readexactly(HEADER_SIZE))
+    return await reader.readexactly(length)
+
+
+async def run_session(session: Session, host: str, port: int, pipeline: int):
+    reader, writer = await asyncio.open_connection(host, port)
+    in_flight = asyncio.Semaphore(pipeline)
+    sent: asyncio.Queue[tuple[str, int] | None] = asyncio.Queue()
+
+    async def send_all(writer: StreamWriter):
+        for target, action, xml in session.requests:
+            await in_flight.acquire()
+            writer.write(encode_frame(target.encode()) + encode_frame(xml.encode()))
+            await sent.put((action, time.perf_counter_ns()))
+            await writer.drain()
+
+        await sent.put(None)
+
+    sender = asyncio.create_task(send_all(writer))
+
+    while (item := await sent.get()) is not None:
+        action, started = item
+        response = await read_frame(reader)
+        session.latencies[action].append(time.perf_counter_ns() - started)
+        in_flight.release()
+
+        if b'Reason=' in response:
+            session.failures += 1
+        if action == 'START':
+            session.deployed_at = time.perf_counter()
+
+    await sender
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentile(values: List[int], fraction: float) -> int:
+    if len(values) == 0:
+        return 0
+
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def summarize(values: List[int]) -> dict[str, int]:
+    return {
+        'count': len(values),
+        'p50': percentile(values, 0.5),
+        'p90': percentile(values, 0.9),
+        'p99': percentile(values, 0.99),
+        'max': max(values, default=0),
+    }
+
+
+async def run_load(fb_count: int, args: argparse.Namespace) -> dict[str, any]:
+    per_session = max(fb_count // args.connections, 2)
+    sessions = [Session(f'RES{i}', per_session) for i in range(args.connections)]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_session(session, args.host, args.port, args.pipeline) for session in sessions))
+    finished = time.perf_counter()
+
+    deployed_at = max(session.deployed_at for session in sessions)
+    deployed_fbs = per_session * len(sessions)
+
+    return {
+        'fbs': deployed_fbs,
+        'connections': len(sessions),
+        'pipeline': args.pipeline,
+        'requests': sum(len(session.requests) for session in sessions),
+        'failures': sum(session.failures for session in sessions),
+        'deploy_seconds': deployed_at - started,
+        'deploy_us_per_fb': (deployed_at - started) / deployed_fbs * 1e6,
+        'total_seconds': finished - started,
+        'latency_ns': {
+            action: summarize([latency for session in sessions for latency in session.latencies[action]])
+            for action in ACTIONS
+        },
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(args: argparse.Namespace) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        BIND_ADDR=args.host,
+        BIND_PORT=str(args.port),
+        MAX_CONNS=str(args.connections + 1),
+        LOG_LEVEL=args.log_level,
+    )
+    server = subprocess.Popen([sys.executable, 'main.py'], cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((args.host, args.port)).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+
+    server.kill()
+    raise RuntimeError(f'Server did not start listening on {args.host}:{args.port}')
+
+
+def stop_server(server: subprocess.Popen) -> float:
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    server.send_signal(signal.SIGINT)
+    try:
+        server.wait(10)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deploy generated applications over the management protocol')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000, 10000], help='FBs per run')
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--pipeline', type=int, default=1, help='requests in flight per connection')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help='use a running server instead of starting one')
+    parser.add_argument('--log-level', default='WARNING', help='LOG_LEVEL of the started server')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    external = args.port is not None
+    results = []
+
+    for size in args.sizes:
+        server = None
+        if not external:
+            args.port = free_port()
+            server = start_server(args)
+
+        try:
+            result = asyncio.run(run_load(size, args))
+        finally:
+            cpu = stop_server(server) if server is not None else None
+
+        result['server_cpu_seconds'] = cpu
+        results.append(result)
+
+        latency = result['latency_ns']
+        print(f'{result["fbs"]:7d} FBs over {result["connections"]} connections: '
+              f'deploy {result["deploy_us_per_fb"]:8.1f} us/FB, '
+              f'CREATE p50 {latency["CREATE"]["p50"] / 1e3:8.1f} us, p99 {latency["CREATE"]["p99"] / 1e3:8.1f} us, '
+              f'server CPU {"n/a" if cpu is None else f"{cpu:.2f} s"}, {result["failures"]} failures')
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
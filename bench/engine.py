@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import time
+import tracemalloc
+from asyncio import Task
+from collections import deque
+from typing import Callable, Coroutine, List
+
+from engine import fb_index
+from engine.core import Engine
+from engine.desc import FbDesc, InputDesc, OutputDesc, ExecContext, parse_ref
+
+
+class Probe(FbDesc):
+    ends: int
+    rounds: int
+    starts: deque[list[int]]
+    latencies: List[int]
+    first: int | None
+    last: int | None
+
+    def __init__(self, ends: int = 1, rounds: int = 0):
+        super().__init__(
+            name='PROBE',
+            inputs=[
+                InputDesc('START', 'event'),
+                InputDesc('END', 'event'),
+            ],
+            outputs=[
+                OutputDesc('NEXT', 'event'),
+            ],
+            synchronous=True,
+        )
+        self.ends = ends
+        self.rounds = rounds
+        self.starts = deque()
+        self.latencies = []
+        self.first = self.last = None
+
+    async def exec(self, context: ExecContext, args: dict[str, any]):
+        stamp = time.perf_counter_ns()
+        if self.first is None:
+            self.first = stamp
+        self.last = stamp
+
+        if context.io_name == 'START':
+            self.start(context, stamp)
+            return
+
+        if len(self.starts) == 0:
+            return
+
+        head = self.starts[0]
+        head[1] -= 1
+        if head[1] > 0:
+            return
+
+        self.starts.popleft()
+        self.latencies.append(stamp - head[0])
+
+        if self.rounds > 0:
+            self.rounds -= 1
+            self.start(context, time.perf_counter_ns())
+
+    def start(self, context: ExecContext, stamp: int):
+        self.starts.append([stamp, self.ends])
+        context.trigger('NEXT')
+
+
+class BenchEngine(Engine):
+    peak_tasks: int
+
+    def __init__(self):
+        super().__init__()
+        self.peak_tasks = 0
+
+    def spawn(self, coro: Coroutine) -> Task:
+        task = super().spawn(coro)
+        if len(self.tasks) > self.peak_tasks:
+            self.peak_tasks = len(self.tasks)
+
+        return task
+
+
+def connect(engine: Engine, src: str, dst: str):
+    engine.add_connection(parse_ref(src), parse_ref(dst))
+
+
+def write(engine: Engine, dst: str, value: any):
+    engine.add_input(parse_ref(dst), value)
+
+
+def add_adder(engine: Engine, fb_id: str, in1: str | None = None, in2: str | None = None):
+    engine.add_fb(fb_id, fb_index.resolve('ADD_2'))
+
+    if in1 is None:
+        write(engine, f'{fb_id}.IN1', '1')
+    else:
+        connect(engine, in1, f'{fb_id}.IN1')
+
+    if in2 is None:
+        write(engine, f'{fb_id}.IN2', '1')
+    else:
+        connect(engine, in2, f'{fb_id}.IN2')
+
+
+def add_chain(engine: Engine, prefix: str, size: int, trigger: str) -> str:
+    add_adder(engine, f'{prefix}0')
+    connect(engine, trigger, f'{prefix}0.REQ')
+
+    for i in range(1, size):
+        add_adder(engine, f'{prefix}{i}', in1=f'{prefix}{i - 1}.OUT')
+        connect(engine, f'{prefix}{i - 1}.CNF', f'{prefix}{i}.REQ')
+
+    return f'{prefix}{size - 1}.CNF'
+
+
+def build_chain(engine: Engine, size: int, args: argparse.Namespace) -> Probe:
+    probe = add_entry(engine, 1, args)
+    connect(engine, add_chain(engine, 'A', size, 'P.NEXT'), 'P.END')
+    return probe
+
+
+def build_fanout(engine: Engine, size: int, args: argparse.Namespace) -> Probe:
+    probe = add_entry(engine, size, args)
+
+    for i in range(size):
+        add_adder(engine, f'A{i}')
+        connect(engine, 'P.NEXT', f'A{i}.REQ')
+        connect(engine, f'A{i}.CNF', 'P.END')
+
+    return probe
+
+
+def build_diamond(engine: Engine, size: int, args: argparse.Namespace) -> Probe:
+    probe = add_entry(engine, 1, args)
+    trigger, value = 'P.NEXT', None
+
+    for i in range(size):
+        add_adder(engine, f'S{i}', in1=value)
+        add_adder(engine, f'L{i}', in1=f'S{i}.OUT')
+        add_adder(engine, f'M{i}', in1=f'S{i}.OUT')
+        add_adder(engine, f'J{i}', in1=f'L{i}.OUT', in2=f'M{i}.OUT')
+
+        connect(engine, trigger, f'S{i}.REQ')
+        connect(engine, f'S{i}.CNF', f'L{i}.REQ')
+        connect(engine, f'S{i}.CNF', f'M{i}.REQ')
+        connect(engine, f'M{i}.CNF', f'J{i}.REQ')
+        trigger, value = f'J{i}.CNF', f'J{i}.OUT'
+
+    connect(engine, trigger, 'P.END')
+    return probe
+
+
+def build_cycle(engine: Engine, size: int, args: argparse.Namespace) -> Probe:
+    engine.add_fb('R', fb_index.resolve('E_RESTART'))
+    engine.add_fb('C', fb_index.resolve('E_CYCLE'))
+    probe = add_probe(engine, Probe())
+
+    connect(engine, 'R.WARM', 'C.START')
+    write(engine, 'C.DT', args.period)
+    connect(engine, 'C.EO', 'P.START')
+    connect(engine, add_chain(engine, 'A', size, 'P.NEXT'), 'P.END')
+    return probe
+
+
+def add_entry(engine: Engine, ends: int, args: argparse.Namespace) -> Probe:
+    engine.add_fb('R', fb_index.resolve('E_RESTART'))
+    probe = add_probe(engine, Probe(ends, args.triggers - 1))
+    connect(engine, 'R.WARM', 'P.START')
+    return probe
+
+
+def add_probe(engine: Engine, probe: Probe) -> Probe:
+    engine.add_fb('P', probe)
+    return probe
+
+
+NETWORKS: dict[str, Callable[[Engine, int, argparse.Namespace], Probe]] = {
+    'chain': build_chain,
+    'fanout': build_fanout,
+    'diamond': build_diamond,
+    'cycle': build_cycle,
+}
+
+
+async def run_engine(engine: Engine, network: str, args: argparse.Namespace):
+    if network != 'cycle':
+        await engine.run()
+        return
+
+    runner = asyncio.create_task(engine.run())
+    await asyncio.sleep(args.duration)
+
+    engine.timers.clear()
+    for task in list(engine.tasks):
+        task.cancel()
+
+    await runner
+
+
+def run_once(network: str, size: int, args: argparse.Namespace) -> tuple[BenchEngine, Probe]:
+    engine = BenchEngine()
+    probe = NETWORKS[network](engine, size, args)
+    asyncio.run(run_engine(engine, network, args))
+    return engine, probe
+
+
+def measure_memory(network: str, size: int, args: argparse.Namespace) -> int:
+    tracemalloc.start()
+    try:
+        run_once(network, size, args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(values: List[int], fraction: float) -> int:
+    if len(values) == 0:
+        return 0
+
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def measure(network: str, size: int, args: argparse.Namespace) -> dict[str, any]:
+    events = 0
+    elapsed = 0
+    failed = 0
+    fbs = 0
+    peak_tasks = 0
+    latencies = []
+
+    for _ in range(args.repeat):
+        engine, probe = run_once(network, size, args)
+
+        events += sum(fb.metrics.executions for fb in engine.fb_index.values() if fb.desc is not probe)
+        elapsed += probe.last - probe.first
+        failed += engine.failed_tasks
+        fbs = len(engine.fb_index)
+        peak_tasks = max(peak_tasks, engine.peak_tasks)
+        latencies.extend(probe.latencies)
+
+    return {
+        'network': network,
+        'size': size,
+        'fbs': fbs,
+        'repeat': args.repeat,
+        'events': events,
+        'events_per_second': events / (elapsed / 1e9) if elapsed > 0 else 0,
+        'latency_ns': {
+            'samples': len(latencies),
+            'p50': percentile(latencies, 0.5),
+            'p90': percentile(latencies, 0.9),
+            'p99': percentile(latencies, 0.99),
+            'max': max(latencies, default=0),
+        },
+        'peak_tasks': peak_tasks,
+        'peak_memory_bytes': measure_memory(network, size, args),
+        'failed_tasks': failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure engine throughput and latency on synthetic networks')
+    parser.add_argument('--networks', nargs='+', choices=NETWORKS.keys(), default=list(NETWORKS.keys()))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--triggers', type=int, default=20, help='sequential triggers per run of non-cycle networks')
+    parser.add_argument('--duration', type=float, default=1.0, help='run time of cycle networks in seconds')
+    parser.add_argument('--period', default='T#1ms', help='E_CYCLE period of cycle networks')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = []
+
+    for network in args.networks:
+        for size in args.sizes:
+            result = measure(network, size, args)
+            results.append(result)
+
+            latency = result['latency_ns']
+            if latency['samples'] > 0:
+                latency_text = f'latency p50 {latency["p50"] / 1e3:10.1f} us, p99 {latency["p99"] / 1e3:10.1f} us'
+            else:
+                latency_text = f'latency {"no complete runs":>33}'
+            print(f'{network:8} {result["fbs"]:7d} FBs: {result["events_per_second"]:12.0f} events/s, {latency_text} '
+                  f'({latency["samples"]:5d} samples), {result["peak_tasks"]:5d} tasks, '
+                  f'{result["peak_memory_bytes"] / 2 ** 20:8.1f} MiB')
+
+    report = {
+        'python': sys.version.split()[0],
+        'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'results': results,
+    }
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import threading
+import time
+from socket import socket, socketpair
+
+from server.framing import FrameDecoder, encode_frame
+
+
+def read_word(s: socket, length: int) -> bytes:
+    buf = b''
+
+    while len(buf) < length:
+        chunk = s.recv(length - len(buf))
+        if not chunk: raise EOFError()
+        buf += chunk
+
+    return buf
+
+
+def read_legacy(s: socket, frame_count: int):
+    for _ in range(frame_count):
+        while read_word(s, 1) != b'\x50': pass
+        length = int.from_bytes(read_word(s, 2), byteorder='big', signed=False)
+        read_word(s, length)
+
+
+def read_buffered(s: socket, frame_count: int):
+    decoder = FrameDecoder()
+    received = 0
+
+    while received < frame_count:
+        if decoder.read_from(s) == 0: raise EOFError()
+        for _ in decoder.frames():
+            received += 1
+
+
+def measure(reader, data: bytes, frame_count: int) -> float:
+    rx, tx = socketpair()
+    writer = threading.Thread(target=tx.sendall, args=(data,))
+
+    started = time.perf_counter()
+    writer.start()
+    reader(rx, frame_count)
+    elapsed = time.perf_counter() - started
+
+    writer.join()
+    rx.close()
+    tx.close()
+    return frame_count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare management protocol frame readers')
+    parser.add_argument('--frames', type=int, default=20000)
+    parser.add_argument('--size', type=int, default=256, help='payload size in bytes')
+    args = parser.parse_args()
+
+    data = encode_frame(b'x' * args.size) * args.frames
+
+    legacy = measure(read_legacy, data, args.frames)
+    buffered = measure(read_buffered, data, args.frames)
+
+    print(f'payload {args.size} B, {args.frames} frames')
+    print(f'legacy recv(1) reader: {legacy:12.0f} frames/s')
+    print(f'buffered recv_into:    {buffered:12.0f} frames/s ({buffered / legacy:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import time
+from typing import List, Callable
+
+from server.proto import RequestMessage
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+def deployment_messages(fb_count: int, batch: int) -> List[RequestMessage]:
+    creates = ['<FB Name="START" Type="E_RESTART" />']
+    creates += [f'<FB Name="ADD_{i}" Type="ADD_2" />' for i in range(fb_count)]
+    writes = []
+
+    for i in range(fb_count):
+        src = f'ADD_{i - 1}.CNF' if i > 0 else 'START.WARM'
+        creates.append(f'<Connection Source="{src}" Destination="ADD_{i}.REQ" />')
+        if i > 0:
+            creates.append(f'<Connection Source="ADD_{i - 1}.OUT" Destination="ADD_{i}.IN1" />')
+        writes.append(f'<Connection Source="{i}.5" Destination="ADD_{i}.IN2" />')
+
+    messages = [RequestMessage('', '<Request ID="1" Action="CREATE"><FB Name="RES" Type="EMB_RES" /></Request>'.encode())]
+    for action, entities in (('CREATE', creates), ('WRITE', writes)):
+        for pos in range(0, len(entities), batch):
+            payload = ''.join(entities[pos:pos + batch])
+            messages.append(RequestMessage('RES', f'<Request ID="{len(messages) + 1}" Action="{action}">{payload}</Request>'.encode()))
+
+    messages.append(RequestMessage('RES', f'<Request ID="{len(messages) + 1}" Action="START" />'.encode()))
+    return messages
+
+
+def parse_legacy(msg: RequestMessage):
+    document = BeautifulSoup(msg.xml_payload, 'xml')
+    request = document.find(name='Request')
+    attrs = (request.attrs['ID'], request.attrs['Action'])
+
+    for child in request.children:
+        if child.name == 'FB':
+            attrs += (child.attrs['Name'], child.attrs['Type'])
+        elif child.name == 'Connection':
+            attrs += (child.attrs['Source'], child.attrs['Destination'])
+
+
+def parse_current(msg: RequestMessage):
+    msg.parse_payload()
+
+
+def measure(parse: Callable[[RequestMessage], None], messages: List[RequestMessage]) -> float:
+    started = time.perf_counter()
+    for msg in messages:
+        parse(msg)
+    return len(messages) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure parsing of deployment requests')
+    parser.add_argument('--fbs', type=int, default=2000, help='number of FBs in the generated deployment')
+    parser.add_argument('--batch', type=int, default=1, help='entities per CREATE/WRITE request (1 as sent by 4diac IDE)')
+    args = parser.parse_args()
+
+    messages = deployment_messages(args.fbs, max(args.batch, 1))
+    print(f'deployment of {args.fbs} FBs, {len(messages)} messages, up to {args.batch} entities per message')
+
+    current = measure(parse_current, messages)
+
+    if BeautifulSoup is None:
+        print('BeautifulSoup: skipped, install requirements-bench.txt to compare')
+        print(f'lxml:          {current:10.0f} messages/s')
+        return
+
+    legacy = measure(parse_legacy, messages)
+    print(f'BeautifulSoup: {legacy:10.0f} messages/s')
+    print(f'lxml:          {current:10.0f} messages/s ({current / legacy:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+from asyncio import Lock, Condition
+
+from engine.table import ValueTable
+
+
+class LegacyValue:
+    def __init__(self, value: any = None, available: bool = False):
+        self.current = value
+        self.available = available
+        self.lock = Lock()
+        self.cond = Condition()
+
+    async def supply(self, value: any):
+        await self.lock.acquire()
+        self.current = value
+        self.available = True
+        self.lock.release()
+
+        await self.cond.acquire()
+        self.cond.notify_all()
+        self.cond.release()
+
+    async def acquire(self) -> any:
+        if self.available:
+            return self.current
+
+        await self.cond.acquire()
+        await self.cond.wait()
+        self.cond.release()
+
+        await self.lock.acquire()
+        value = self.current
+        self.lock.release()
+        return value
+
+
+async def supply_legacy(value: LegacyValue, i: int):
+    await value.supply(i)
+
+
+class TableValue:
+    table: ValueTable
+    slot: int
+
+    def __init__(self, table: ValueTable | None = None):
+        self.table = ValueTable() if table is None else table
+        self.slot = self.table.allocate()
+
+    async def acquire(self) -> any:
+        return await self.table.acquire(self.slot)
+
+
+async def supply_current(value: TableValue, i: int):
+    value.table.supply(value.slot, i)
+
+
+async def measure_available(value, supply, count: int) -> float:
+    started = time.perf_counter()
+    for i in range(count):
+        await supply(value, i)
+        await value.acquire()
+    return count / (time.perf_counter() - started)
+
+
+async def measure_wakeups(value_factory, supply, rounds: int, consumers: int) -> float:
+    started = time.perf_counter()
+
+    for i in range(rounds):
+        value = value_factory()
+        waiting = [asyncio.create_task(value.acquire()) for _ in range(consumers)]
+        await asyncio.sleep(0)
+        await supply(value, i)
+        await asyncio.gather(*waiting)
+
+    return rounds * consumers / (time.perf_counter() - started)
+
+
+def measure_memory(value_factory, count: int) -> float:
+    tracemalloc.start()
+    try:
+        values = [value_factory() for _ in range(count)]
+        used = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return used / len(values)
+
+
+async def run(args: argparse.Namespace):
+    legacy = await measure_available(LegacyValue(), supply_legacy, args.count)
+    current = await measure_available(TableValue(), supply_current, args.count)
+    print(f'supply + acquire of available value, {args.count} times')
+    print(f'Lock + Condition: {legacy:12.0f} ops/s')
+    print(f'value table slot: {current:12.0f} ops/s ({current / legacy:.1f}x)')
+
+    legacy = await measure_wakeups(LegacyValue, supply_legacy, args.rounds, args.consumers)
+    current = await measure_wakeups(TableValue, supply_current, args.rounds, args.consumers)
+    print(f'{args.consumers} consumers waiting for a supply, {args.rounds} rounds')
+    print(f'Lock + Condition: {legacy:12.0f} wake-ups/s')
+    print(f'value table slot: {current:12.0f} wake-ups/s ({current / legacy:.1f}x)')
+
+    table = ValueTable()
+    legacy = measure_memory(LegacyValue, args.values)
+    current = measure_memory(lambda: table.allocate(), args.values)
+    print(f'memory per value, {args.values} values')
+    print(f'Lock + Condition: {legacy:12.1f} bytes')
+    print(f'value table slot: {current:12.1f} bytes ({legacy / current:.1f}x less)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure supply/acquire throughput of value slots')
+    parser.add_argument('--count', type=int, default=200000)
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--consumers', type=int, default=16)
+    parser.add_argument('--values', type=int, default=100000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
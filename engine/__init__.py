@@ -1,2 +1,4 @@
 from .fb import fb_index
-from .store import EngineStore, NoSuchResourceException, AlreadyExistsException
+from .host import RuntimeHost
+from .store import EngineStore, NoSuchResourceException, AlreadyExistsException, InvalidStateException
+from .shard import ShardedEngineStore
@@ -0,0 +1,57 @@
+import logging
+
+import numpy
+from numpy import ndarray
+
+from engine.core import Engine, IncompatibleException
+from engine.desc import FbDesc, InputDesc, Ref
+
+logger = logging.getLogger(__name__)
+
+
+class BatchEngine(Engine):
+    instances: int
+
+    def __init__(self, instances: int):
+        super().__init__()
+        self.instances = instances
+        self.resource_type = 'BATCH_RES'
+
+    def check_connection(self, src: Ref, dst: Ref, src_desc: FbDesc, dst_desc: FbDesc):
+        super().check_connection(src, dst, src_desc, dst_desc)
+
+        src_output = src_desc.get_output(src.io_name)
+        is_data = src_output is not None and src_output.kind == 'value'
+        if is_data and not (src_desc.vectorized and dst_desc.vectorized):
+            raise IncompatibleException('Connection', f'{src} -> {dst}')
+
+    def convert_input(self, dst: Ref, desc: FbDesc, value: any) -> any:
+        if desc.vectorized:
+            return self.broadcast(dst, self.get_value_input(dst, desc), value)
+
+        return super().convert_input(dst, desc, value)
+
+    def same_value(self, current: any, value: any) -> bool:
+        if isinstance(current, ndarray) or isinstance(value, ndarray):
+            return type(current) is type(value) and current.dtype == value.dtype and numpy.array_equal(current, value)
+
+        return super().same_value(current, value)
+
+    def broadcast(self, dst: Ref, fb_input: InputDesc, value: any) -> ndarray:
+        if isinstance(value, str) and value.startswith('[') and value.endswith(']'):
+            items = [self.parse_input(dst, fb_input, item) for item in value[1:-1].split(',')]
+        elif isinstance(value, (list, tuple, ndarray)):
+            items = value
+        else:
+            if isinstance(value, str):
+                value = self.parse_input(dst, fb_input, value)
+            items = [value] * self.instances
+
+        if len(items) != self.instances:
+            logger.error('Expected %d values for %s, got %d', self.instances, dst, len(items))
+            raise IncompatibleException('Input', str(dst))
+
+        try:
+            return numpy.asarray(items, dtype=numpy.float64)
+        except (TypeError, ValueError):
+            return numpy.asarray(items)
@@ -1,18 +1,28 @@
 import asyncio
 import logging
-from asyncio import Lock, Condition, Event
-from typing import List
+from asyncio import Event, Task, AbstractEventLoop
+from collections import deque
+from time import perf_counter_ns
+from typing import List, Coroutine, Callable
 
+from engine.deploy import Deployment
 from engine.desc import ExecContext, InputDesc, FbDesc, Controller, Lifecycle, Ref
 from engine.fb.events.E_RESTART import E_RESTART
+from engine.literals import parse_literal
+from engine.table import ValueTable, ValueSnapshot
+from engine.timers import Timer, TimerService
+from engine.metrics import FbMetrics, EngineMetrics, FbStats, ConnectionStats
+from logs import get_tracer
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(logger)
 
 class ResourceException(Exception):
     resource: str
     resource_id: str
 
     def __init__(self, resource: str, resource_id: str):
+        super().__init__(resource, resource_id)
         self.resource = resource
         self.resource_id = resource_id
 
@@ -45,174 +55,221 @@ class NotFoundException(ResourceException):
         return 'NO_SUCH_RESOURCE'
 
 
-class Value:
-    current: any
-    available: bool
-    lock: Lock
-    cond: Condition
-
-    def __init__(self, value: any = None, available: bool = False):
-        self.current = value
-        self.available = available
-        self.lock = Lock()
-        self.cond = Condition()
-
-    async def supply(self, value: any):
-        logger.debug('Waiting for supply lock')
-        await self.lock.acquire()
-        self.current = value
-        self.available = True
-        self.lock.release()
-
-        logger.debug('Supplied value, waiting for cond lock')
-        await self.cond.acquire()
-        self.cond.notify_all()
-        self.cond.release()
-
-        logger.debug('Successfully supplied value %s', self.current)
-
-    async def acquire(self) -> any:
-        if self.available:
-            logger.debug('Immediately returning available value %s', self.current)
-            return self.current
-
-        logger.debug('Acquiring cond lock')
-        await self.cond.acquire()
-
-        logger.debug('Waiting for value to be supplied')
-        await self.cond.wait()
-        self.cond.release()
-
-        logger.debug('Value acquired, waiting for value lock')
-        await self.lock.acquire()
-        value = self.current
-        self.lock.release()
+class IncompatibleException(ResourceException):
+    def __init__(self, resource: str, resource_id: str):
+        super().__init__(resource, resource_id)
 
-        logger.debug('Got value %s', value)
-        return value
+    def message(self) -> str:
+        return f'IncompatibleException: {self.resource} {self.resource_id}'
 
-    def release(self):
-        if self.lock.locked():
-            self.lock.release()
+    def reason(self) -> str:
+        return 'INVALID_OPERATION'
 
 
 class ValueContainer:
-    values: dict[str, Value]
+    __slots__ = ('table', 'values')
+
+    table: ValueTable
+    values: tuple[tuple[str, int], ...]
 
-    def __init__(self, values: dict[str, Value]):
+    def __init__(self, table: ValueTable, values: tuple[tuple[str, int], ...]):
+        self.table = table
         self.values = values
 
     async def __aenter__(self):
         return await self.acquire_all()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        return self.release_all()
+        return None
 
     async def acquire_all(self) -> dict[str, any]:
         res = {}
+        table = self.table
+        available = table.available
+        current = table.current
 
-        for k, v in self.values.items():
-            logger.debug('Now will wait for %s value', k)
-            res[k] = await v.acquire()
+        for k, slot in self.values:
+            if available[slot]:
+                res[k] = current[slot]
+            else:
+                if trace.enabled:
+                    logger.debug('Now will wait for %s value', k)
+                res[k] = await table.next(slot)
 
         return res
 
-    def release_all(self):
-        for v in self.values.values():
-            v.release()
-
 
 class FB:
+    __slots__ = ('fb_id', 'desc', 'controller', 'store', 'plan', 'metrics', 'refs', 'contexts', 'default_slots', 'removed')
+
     fb_id: str
     desc: FbDesc
     controller: Controller
     store: dict[str, any]
+    plan: 'ExecPlan | None'
+    metrics: FbMetrics
+    refs: dict[str, Ref]
+    contexts: dict[str, ExecContext]
+    default_slots: dict[str, int]
+    removed: bool
 
     def __init__(self, fb_id: str, desc: FbDesc, controller: Controller):
         self.fb_id = fb_id
         self.desc = desc
         self.controller = controller
         self.store = {}
+        self.plan = None
+        self.metrics = FbMetrics()
+        self.refs = {port.name: Ref(fb_id, port.name) for port in (*desc.inputs, *desc.outputs)}
+        self.contexts = {}
+        self.default_slots = {}
+        self.removed = False
+
+    def get_context(self, io_name: str) -> ExecContext:
+        ctx = self.contexts.get(io_name)
+        if ctx is None:
+            ctx = self.contexts[io_name] = ExecContext(
+                fb_id=self.fb_id,
+                io_name=io_name,
+                controller=self.controller,
+                lifecycle=self.controller.context_lifecycle,
+                store=self.store,
+                refs=self.refs,
+            )
+
+        return ctx
 
     async def exec(self, io_name: str, args: dict[str, any]):
-        ctx = ExecContext(
-            fb_id=self.fb_id,
-            io_name=io_name,
-            controller=self.controller,
-            lifecycle=self.controller.context_lifecycle,
-            store = self.store,
-        )
-
-        await self.desc.exec(ctx, args)
+        ctx = self.get_context(io_name)
+
+        started = perf_counter_ns()
+        try:
+            await self.desc.exec(ctx, args)
+        except Exception:
+            self.metrics.failures += 1
+            raise
+        finally:
+            self.metrics.executions += 1
+            self.metrics.exec_time.record(perf_counter_ns() - started)
 
     def __str__(self):
         return f'FB({self.fb_id})'
 
 
-class Entrypoint(FB):
-    lifecycle: Lifecycle
-
-    def __init__(self, fb_id: str, desc: FbDesc, controller: Controller, lifecycle: Lifecycle):
-        super().__init__(fb_id, desc, controller)
-        self.lifecycle = lifecycle
-
-
-class Input:
-    desc: InputDesc
-    fb: FB
-    prev_out: Ref
-
-    def __init__(self, desc, fb):
-        self.desc = desc
-        self.fb = fb
-
-
 class Connection:
-    conn_id: str
+    __slots__ = ('index', 'src', 'dst', 'slot', 'supplies', 'triggers')
+
+    index: int
     src: Ref
     dst: Ref
-    value: Value
+    slot: int
+    supplies: int
+    triggers: int
 
-    def __init__(self, conn_id: str, src: Ref, dst: Ref, value = Value()):
-        self.conn_id = conn_id
+    def __init__(self, index: int, src: Ref, dst: Ref, slot: int):
+        self.index = index
         self.src = src
         self.dst = dst
-        self.value = value
+        self.slot = slot
+        self.supplies = 0
+        self.triggers = 0
+
+    @property
+    def conn_id(self) -> str:
+        return str(self.index)
 
     def __str__(self):
-        return f'Connection({self.conn_id}, {self.src}, {self.dst}, "{self.value}")'
+        return f'Connection({self.conn_id}, {self.src}, {self.dst}, slot {self.slot})'
+
+
+INPUT_SOURCE = Ref(0, 'IN')
 
 
 class InputConnection(Connection):
-    def __init__(self, conn_id: str, dst: Ref, value: any):
-        super().__init__(conn_id, Ref(0, 'IN'), dst, Value(value=value, available=True))
+    __slots__ = ()
+
+    def __init__(self, index: int, dst: Ref, slot: int):
+        super().__init__(index, INPUT_SOURCE, dst, slot)
 
     def __str__(self):
-        return f'InputConnection({self.conn_id}, {self.dst}, {self.value})'
+        return f'InputConnection({self.conn_id}, {self.dst}, slot {self.slot})'
+
+
+class ExecPlan:
+    __slots__ = ('inputs', 'outputs', 'targets')
+
+    inputs: tuple[tuple[str, int], ...]
+    outputs: dict[str, tuple[Connection, ...]]
+    targets: dict[str, tuple[tuple[str, FB, Connection], ...]]
+
+    def __init__(self, inputs: tuple[tuple[str, int], ...], outputs: dict[str, tuple[Connection, ...]],
+                 targets: dict[str, tuple[tuple[str, FB, Connection], ...]]):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.targets = targets
 
 
 class Engine(Controller):
-    tasks = []
+    MAX_KEPT_ERRORS = 100
+    STOP_TIMEOUT = 1.0
+    DISPATCH_BUDGET = 64
+
+    main_task: Task | None
+    stopping: Task | None
+    tasks: set[Task]
+    idle: Event
+    errors: deque[BaseException]
+    failed_tasks: int
+    pending: deque[tuple[str, 'FB']]
+    dispatching: bool
 
     fb_index: dict[str, FB]
-    connections: dict[str, Connection]
+    connections: dict[int, Connection]
+    outputs_index: dict[Ref, list[Connection]]
+    inputs_index: dict[Ref, list[Connection]]
     lifecycle: Lifecycle
     entry_points: List[FB]
-
-    last_conn_id = 0
+    loop: AbstractEventLoop | None
+    table: ValueTable
+    resource_type: str
+    last_conn_id: int
 
     def __init__(self):
         self.lifecycle = Lifecycle(start_event=Event())
         super().__init__(self.lifecycle)
 
+        self.table = ValueTable()
+        self.resource_type = 'EMB_RES'
+        self.last_conn_id = 0
         self.fb_index = {}
         self.connections = {}
+        self.outputs_index = {}
+        self.inputs_index = {}
         self.entry_points = []
-
-    def start(self):
-        asyncio.run(self.run())
+        self.loop = None
+
+        self.main_task = None
+        self.stopping = None
+        self.tasks = set()
+        self.idle = Event()
+        self.idle.set()
+        self.errors = deque(maxlen=self.MAX_KEPT_ERRORS)
+        self.failed_tasks = 0
+        self.pending = deque()
+        self.dispatching = False
+
+    @property
+    def task_count(self) -> int:
+        return len(self.tasks)
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None
 
     async def run(self):
+        self.main_task = asyncio.current_task()
+        self.compile()
+
         for entry_point in self.entry_points:
             logger.debug('Running entry point %s', entry_point)
             self.run_fb('', entry_point)
@@ -223,13 +280,308 @@ class Engine(Controller):
         logger.debug('Triggering start lifecycle event')
         self.lifecycle.start.set()
 
-        for task in self.tasks:
-            await task
+        while not (self.idle.is_set() and self.timers.idle.is_set()):
+            await self.idle.wait()
+            await self.timers.idle.wait()
+
+        if self.stopping is None:
+            self.detach_loop()
+            logger.info('Engine finished, no tasks or timers left')
+
+    async def stop(self):
+        if self.loop is None:
+            return
+
+        if self.stopping is None:
+            self.timers.clear()
+            for entry_point in self.entry_points:
+                self.trigger(entry_point.refs['STOP'])
+
+            self.stopping = self.loop.create_task(self.drain())
+            logger.info('Stopping engine with %d tasks', len(self.tasks))
+
+        await asyncio.wait((self.stopping,))
+
+    async def drain(self):
+        try:
+            await asyncio.wait_for(self.idle.wait(), self.STOP_TIMEOUT)
+        except TimeoutError:
+            logger.warning('Engine did not stop within %s seconds, killing %d tasks', self.STOP_TIMEOUT, len(self.tasks))
+
+        self.kill()
+
+    def kill(self):
+        if not self.on_loop():
+            return self.call_on_loop(self.kill)
+
+        if self.loop is None:
+            return
+
+        current = asyncio.current_task()
+        for task in (self.main_task, self.stopping):
+            if task is not None and task is not current:
+                task.cancel()
+
+        tasks, self.tasks = self.tasks, set()
+        for task in tasks:
+            task.cancel()
+
+        self.detach_loop()
+        logger.info('Killed engine, cancelled %d tasks', len(tasks))
+
+    def detach_loop(self):
+        self.discard_state()
+        self.dispatching = False
+        self.idle = Event()
+        self.idle.set()
+        self.lifecycle.start = Event()
+        self.main_task = self.stopping = None
+        self.loop = None
+
+    def discard_state(self):
+        self.timers.clear()
+        self.timers = TimerService()
+        self.table.cancel_waiters()
+        self.pending.clear()
+
+        for fb in self.fb_index.values():
+            fb.store.clear()
+            fb.contexts.clear()
+
+    def reset(self):
+        if not self.on_loop():
+            return self.call_on_loop(self.reset)
+
+        self.kill()
+        self.discard_state()
+
+        for conn in self.connections.values():
+            conn.supplies = conn.triggers = 0
+            if conn.slot >= 0 and not isinstance(conn, InputConnection):
+                self.table.reset(conn.slot)
+
+        for fb in self.fb_index.values():
+            fb.metrics = FbMetrics()
+            fb.plan = None
+
+        self.errors.clear()
+        self.failed_tasks = 0
+        logger.info('Reset engine with %d FBs', len(self.fb_index))
+
+    def release(self):
+        if not self.on_loop():
+            return self.call_on_loop(self.release)
+
+        self.kill()
+
+        for fb in self.fb_index.values():
+            fb.removed = True
+            fb.plan = None
+
+        self.fb_index.clear()
+        self.connections.clear()
+        self.outputs_index.clear()
+        self.inputs_index.clear()
+        self.entry_points.clear()
+        self.errors.clear()
+        self.table.clear()
+
+    def on_loop(self) -> bool:
+        if self.loop is None or not self.loop.is_running():
+            return True
+
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def call_on_loop(self, fn: Callable, *args) -> any:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run_coroutine_threadsafe(self.execute(fn, *args), self.loop).result()
+
+        raise RuntimeError('Blocking engine call from an event loop, await Engine.execute() instead')
+
+    async def execute(self, fn: Callable, *args) -> any:
+        loop = self.loop
+        if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.execute(fn, *args), loop))
+
+        result = fn(*args)
+        if asyncio.iscoroutine(result):
+            result = await result
+
+        return result
 
     def add_fb(self, fb_id: str, desc: FbDesc):
+        if not self.on_loop():
+            return self.call_on_loop(self.add_fb, fb_id, desc)
+
         if fb_id in self.fb_index:
             raise DuplicateException('FB', fb_id)
 
+        self.load_fb(fb_id, desc)
+        logger.info('Loaded FB %s %s', fb_id, desc)
+
+    def add_connection(self, src: Ref, dst: Ref):
+        if not self.on_loop():
+            return self.call_on_loop(self.add_connection, src, dst)
+
+        self.check_connection(src, dst, self.get_desc(src), self.get_desc(dst))
+
+        conn = self.load_connection(src, dst)
+        logger.info('Loaded connection %s %s', conn.conn_id, conn)
+
+    def add_input(self, dst: Ref, value: any):
+        if not self.on_loop():
+            return self.call_on_loop(self.add_input, dst, value)
+
+        value = self.convert_input(dst, self.get_desc(dst), value)
+
+        conn = self.load_input(dst, value)
+        logger.info('Loaded input connection %s %s = %r', conn.conn_id, conn, value)
+
+    def check(self, deployment: Deployment, staged: dict[str, FbDesc]):
+        if not self.on_loop():
+            return self.call_on_loop(self.check, deployment, staged)
+
+        self.validate(deployment, dict(staged), not deployment.replace)
+
+    def commit(self, deployment: Deployment):
+        if not self.on_loop():
+            return self.call_on_loop(self.commit, deployment)
+
+        inputs = self.validate(deployment, {}, True)
+
+        for fb_id, desc in deployment.fbs:
+            self.load_fb(fb_id, desc)
+        for src, dst in deployment.connections:
+            self.load_connection(src, dst)
+        for dst, value in inputs:
+            self.load_input(dst, value)
+
+        logger.info('Committed deployment of %d FBs, %d connections and %d inputs',
+                    len(deployment.fbs), len(deployment.connections), len(inputs))
+
+    def redeploy(self, deployment: Deployment):
+        if not self.on_loop():
+            return self.call_on_loop(self.redeploy, deployment)
+
+        desired = {}
+        inputs = dict(self.validate(deployment, desired, False))
+
+        kept = set()
+        removed_fbs = []
+        for fb_id, fb in self.fb_index.items():
+            if fb_id in desired and desired[fb_id].name == fb.desc.name:
+                kept.add(fb_id)
+            else:
+                removed_fbs.append(fb)
+
+        wanted = dict.fromkeys(deployment.connections)
+        existing = set()
+        removed_conns = []
+        for conn in self.connections.values():
+            if isinstance(conn, InputConnection):
+                if conn.dst.fb_id in kept and conn.dst not in inputs:
+                    removed_conns.append(conn)
+            elif conn.src.fb_id in kept and conn.dst.fb_id in kept:
+                if (conn.src, conn.dst) in wanted:
+                    existing.add((conn.src, conn.dst))
+                else:
+                    removed_conns.append(conn)
+
+        added_fbs = [(fb_id, desc) for fb_id, desc in desired.items() if fb_id not in kept]
+        added_conns = [conn for conn in wanted if conn not in existing]
+        changed_inputs = [(dst, value) for dst, value in inputs.items() if not self.has_input(dst, value)]
+
+        for conn in removed_conns:
+            self.unload_connection(conn)
+        for fb in removed_fbs:
+            self.unload_fb(fb)
+        for fb_id, desc in added_fbs:
+            self.load_fb(fb_id, desc)
+        for src, dst in added_conns:
+            self.load_connection(src, dst)
+        for dst, value in changed_inputs:
+            self.load_input(dst, value)
+
+        logger.info('Redeployed %d FBs: added %d and removed %d FBs, added %d and removed %d connections, changed %d inputs',
+                    len(desired), len(added_fbs), len(removed_fbs), len(added_conns), len(removed_conns), len(changed_inputs))
+
+    def has_input(self, dst: Ref, value: any) -> bool:
+        for conn in self.get_inputs(dst):
+            if isinstance(conn, InputConnection):
+                return self.same_value(self.table.current[conn.slot], value)
+
+        return False
+
+    def same_value(self, current: any, value: any) -> bool:
+        return type(current) is type(value) and current == value
+
+    def validate(self, deployment: Deployment, staged: dict[str, FbDesc], existing: bool) -> List[tuple[Ref, any]]:
+        for fb_id, desc in deployment.fbs:
+            if fb_id in staged or existing and fb_id in self.fb_index:
+                raise DuplicateException('FB', fb_id)
+            staged[fb_id] = desc
+
+        def get_desc(ref: Ref) -> FbDesc:
+            if ref.fb_id in staged:
+                return staged[ref.fb_id]
+            if existing:
+                return self.get_desc(ref)
+            raise NotFoundException('FB', ref.fb_id)
+
+        for src, dst in deployment.connections:
+            self.check_connection(src, dst, get_desc(src), get_desc(dst))
+
+        return [(dst, self.convert_input(dst, get_desc(dst), value)) for dst, value in deployment.inputs]
+
+    def get_desc(self, ref: Ref) -> FbDesc:
+        fb = self.fb_index.get(ref.fb_id)
+        if fb is None:
+            raise NotFoundException('FB', ref.fb_id)
+
+        return fb.desc
+
+    def check_connection(self, src: Ref, dst: Ref, src_desc: FbDesc, dst_desc: FbDesc):
+        src_output = src_desc.get_output(src.io_name)
+        if src_output is None:
+            raise NotFoundException('Output', f'{src.fb_id}.{src.io_name}')
+
+        dst_input = dst_desc.get_input(dst.io_name)
+        if dst_input is None:
+            raise NotFoundException('Input', f'{dst.fb_id}.{dst.io_name}')
+
+        if src_output.kind != dst_input.kind:
+            raise IncompatibleException('Connection', f'{src.fb_id}.{src.io_name} -> {dst.fb_id}.{dst.io_name}')
+
+    def convert_input(self, dst: Ref, desc: FbDesc, value: any) -> any:
+        fb_input = self.get_value_input(dst, desc)
+        if isinstance(value, str):
+            return self.parse_input(dst, fb_input, value)
+
+        return value
+
+    def get_value_input(self, dst: Ref, desc: FbDesc) -> InputDesc:
+        fb_input = desc.get_input(dst.io_name)
+        if fb_input is None:
+            raise NotFoundException('Input', f'{dst.fb_id}.{dst.io_name}')
+
+        if fb_input.kind != 'value':
+            raise IncompatibleException('Input', f'{dst.fb_id}.{dst.io_name}')
+
+        return fb_input
+
+    def parse_input(self, dst: Ref, fb_input: InputDesc, value: str) -> any:
+        try:
+            return parse_literal(value, fb_input.data_type)
+        except ValueError:
+            logger.error('Cannot convert %r to %s for %s', value, fb_input.data_type, dst)
+            raise IncompatibleException('Input', f'{dst.fb_id}.{dst.io_name}')
+
+    def load_fb(self, fb_id: str, desc: FbDesc) -> FB:
         fb = FB(fb_id, desc, self)
 
         if isinstance(desc, E_RESTART):
@@ -237,38 +589,169 @@ class Engine(Controller):
             self.entry_points.append(fb)
 
         self.fb_index[fb_id] = fb
-        logger.info('Loaded FB %s %s', fb_id, desc)
+        return fb
 
-    def add_connection(self, src: Ref, dst: Ref):
-        if src.fb_id not in self.fb_index:
-            raise NotFoundException('FB', src.fb_id)
+    def load_connection(self, src: Ref, dst: Ref) -> Connection:
+        self.last_conn_id += 1
+
+        src_output = self.fb_index[src.fb_id].desc.get_output(src.io_name)
+        slot = -1 if src_output is not None and src_output.kind == 'event' else self.table.allocate()
 
-        if dst.fb_id not in self.fb_index:
-            raise NotFoundException('FB', dst.fb_id)
+        conn = Connection(self.last_conn_id, self.intern_ref(src), self.intern_ref(dst), slot)
+        self.connections[conn.index] = conn
+        self.index_connection(conn)
+        return conn
+
+    def load_input(self, dst: Ref, value: any) -> Connection:
+        for conn in self.get_inputs(dst):
+            if isinstance(conn, InputConnection):
+                self.table.supply(conn.slot, value)
+                return conn
 
         self.last_conn_id += 1
-        conn_id = str(self.last_conn_id)
 
-        if conn_id in self.connections:
-            raise DuplicateException('Connection', conn_id)
+        conn = InputConnection(self.last_conn_id, self.intern_ref(dst), self.table.allocate(value, True))
+        self.connections[conn.index] = conn
+        self.index_connection(conn)
+        return conn
 
-        conn = Connection(conn_id, src, dst, Value())
-        self.connections[conn_id] = conn
-        logger.info('Loaded connection %s %s', conn_id, conn)
+    def intern_ref(self, ref: Ref) -> Ref:
+        return self.fb_index[ref.fb_id].refs.get(ref.io_name, ref)
 
-    def add_input(self, dst: Ref, value: any):
-        if dst.fb_id not in self.fb_index:
-            raise NotFoundException('FB', dst.fb_id)
+    def remove_connection(self, conn_id: str):
+        if not self.on_loop():
+            return self.call_on_loop(self.remove_connection, conn_id)
 
-        self.last_conn_id += 1
-        conn_id = str(self.last_conn_id)
+        index = int(conn_id) if conn_id.isdigit() else -1
+        if index not in self.connections:
+            raise NotFoundException('Connection', conn_id)
+
+        self.unload_connection(self.connections[index])
+
+    def unload_connection(self, conn: Connection):
+        del self.connections[conn.index]
+        self.unindex_connection(conn)
+        if conn.slot >= 0:
+            self.table.release(conn.slot)
+        logger.info('Removed connection %s %s', conn.conn_id, conn)
+
+    def disconnect(self, src: Ref, dst: Ref):
+        if not self.on_loop():
+            return self.call_on_loop(self.disconnect, src, dst)
+
+        conns = [conn for conn in self.get_inputs(dst) if conn.src == src]
+        if len(conns) == 0:
+            raise NotFoundException('Connection', f'{src.fb_id}.{src.io_name} -> {dst.fb_id}.{dst.io_name}')
+
+        for conn in conns:
+            self.unload_connection(conn)
+
+    def remove_fb(self, fb_id: str):
+        if not self.on_loop():
+            return self.call_on_loop(self.remove_fb, fb_id)
+
+        if fb_id not in self.fb_index:
+            raise NotFoundException('FB', fb_id)
+
+        self.unload_fb(self.fb_index[fb_id])
+
+    def unload_fb(self, fb: FB):
+        attached = {}
+        for fb_input in fb.desc.inputs:
+            attached.update((conn.index, conn) for conn in self.get_inputs(fb.refs[fb_input.name]))
+        for fb_output in fb.desc.outputs:
+            attached.update((conn.index, conn) for conn in self.get_outputs(fb.refs[fb_output.name]))
+
+        for conn in attached.values():
+            self.unload_connection(conn)
 
-        if conn_id in self.connections:
-            raise DuplicateException('Connection', conn_id)
+        if fb in self.entry_points:
+            self.entry_points.remove(fb)
 
-        conn = InputConnection(conn_id, dst, value)
-        self.connections[conn_id] = conn
-        logger.info('Loaded input connection %s %s', conn_id, conn)
+        for slot in fb.default_slots.values():
+            self.table.release(slot)
+
+        for value in fb.store.values():
+            if isinstance(value, Timer):
+                value.cancel()
+
+        fb.removed = True
+        fb.plan = None
+        del self.fb_index[fb.fb_id]
+        logger.info('Removed FB %s', fb.fb_id)
+
+    def index_connection(self, conn: Connection):
+        if not isinstance(conn, InputConnection):
+            self.outputs_index.setdefault(conn.src, []).append(conn)
+
+        self.inputs_index.setdefault(conn.dst, []).append(conn)
+        self.invalidate_plans(conn)
+
+    def unindex_connection(self, conn: Connection):
+        self.invalidate_plans(conn)
+
+        for index, ref in ((self.outputs_index, conn.src), (self.inputs_index, conn.dst)):
+            conns = index.get(ref)
+            if conns is None or conn not in conns:
+                continue
+
+            conns.remove(conn)
+            if len(conns) == 0:
+                del index[ref]
+
+    def invalidate_plans(self, conn: Connection):
+        for ref in (conn.src, conn.dst):
+            fb = self.fb_index.get(ref.fb_id)
+            if fb is not None:
+                fb.plan = None
+
+    def compile(self):
+        for fb in self.fb_index.values():
+            fb.plan = self.compile_plan(fb)
+
+        logger.debug('Compiled execution plans for %d FBs', len(self.fb_index))
+
+    def compile_plan(self, fb: FB) -> ExecPlan:
+        inputs = []
+        for fb_input in fb.desc.get_value_inputs():
+            conns = self.get_inputs(fb.refs[fb_input.name])
+
+            if len(conns) > 1:
+                logger.warning('There should be zero or one input, got %d for %s of %s', len(conns), fb_input.name, fb.fb_id)
+
+            if len(conns) == 0:
+                slot = self.get_default_slot(fb, fb_input)
+            else:
+                slot = next((c for c in conns if not isinstance(c, InputConnection)), conns[0]).slot
+
+            inputs.append((fb_input.name, slot))
+
+        outputs = {}
+        targets = {}
+        for fb_output in fb.desc.outputs:
+            conns = tuple(self.get_outputs(fb.refs[fb_output.name]))
+            if len(conns) == 0:
+                continue
+
+            if fb_output.kind == 'event':
+                targets[fb_output.name] = tuple((conn.dst.io_name, self.resolve_fb(conn.dst), conn) for conn in conns)
+            else:
+                outputs[fb_output.name] = conns
+
+        return ExecPlan(tuple(inputs), outputs, targets)
+
+    def get_default_slot(self, fb: FB, fb_input: InputDesc) -> int:
+        slot = fb.default_slots.get(fb_input.name)
+        if slot is None:
+            slot = fb.default_slots[fb_input.name] = self.table.allocate(fb_input.default_value, True)
+
+        return slot
+
+    def get_plan(self, fb: FB) -> ExecPlan:
+        if fb.plan is None:
+            fb.plan = self.compile_plan(fb)
+
+        return fb.plan
 
     def resolve_fb(self, ref: Ref) -> FB:
         if ref.fb_id not in self.fb_index:
@@ -278,72 +761,147 @@ class Engine(Controller):
         return fb
 
     def get_outputs(self, src: Ref) -> list[Connection]:
-        res = []
-
-        for conn in self.connections.values():
-            if conn.src.fb_id == src.fb_id and conn.src.io_name == src.io_name:
-                res.append(conn)
-
-        return res
+        return self.outputs_index.get(src, [])
 
     def get_inputs(self, dst: Ref) -> list[Connection]:
-        res = []
+        return self.inputs_index.get(dst, [])
 
-        for conn in self.connections.values():
-            if conn.dst.fb_id == dst.fb_id and conn.dst.io_name == dst.io_name:
-                res.append(conn)
+    def snapshot(self) -> ValueSnapshot:
+        return self.table.snapshot()
 
-        return res
+    def metrics(self, fb_ids: List[str] | None = None) -> EngineMetrics:
+        if fb_ids is None:
+            fb_ids = list(self.fb_index.keys())
 
-    def build_args(self, fb: FB) -> ValueContainer:
-        values = {}
-
-        for fb_input in fb.desc.get_value_inputs():
-            inputs = self.get_inputs(Ref(fb.fb_id, fb_input.name))
-            input_count = len(inputs)
+        for fb_id in fb_ids:
+            if fb_id not in self.fb_index:
+                raise NotFoundException('FB', fb_id)
 
-            if input_count > 1:
-                logger.warning(f"There should be zero ore one input, got {input_count} for {fb_input.name} of {fb.fb_id}")
+        fbs = [self.fb_index[fb_id] for fb_id in fb_ids]
+        selected = set(fb_ids)
 
-            if input_count == 0:
-                values[fb_input.name] = Value(value=fb_input.default_value, available=True)
-            else:
-                for inp in inputs:
-                    if not isinstance(inp, InputConnection):
-                        conn = inputs[0]
-                        break
-                else:
-                    conn = inputs[0]
-
-                values[fb_input.name] = conn.value
+        return EngineMetrics(
+            [FbStats(fb.fb_id, fb.desc.name, fb.metrics.copy()) for fb in fbs],
+            [
+                ConnectionStats(f'{conn.src.fb_id}.{conn.src.io_name}', f'{conn.dst.fb_id}.{conn.dst.io_name}', conn.supplies, conn.triggers)
+                for conn in list(self.connections.values())
+                if not isinstance(conn, InputConnection) and (conn.src.fb_id in selected or conn.dst.fb_id in selected)
+            ],
+        )
 
-        return ValueContainer(values)
+    def build_args(self, fb: FB) -> ValueContainer:
+        return ValueContainer(self.table, self.get_plan(fb).inputs)
 
     async def exec_fb(self, io_name: str, fb: FB):
-        logger.debug(f'Trying to acquire inputs for FB {fb.fb_id}')
+        if fb.removed:
+            return
+
+        if trace.enabled:
+            logger.debug('Trying to acquire inputs for FB %s', fb.fb_id)
+        started = perf_counter_ns()
         async with self.build_args(fb) as args:
-            logger.debug(f'Acquired inputs for FB {fb.fb_id}')
+            fb.metrics.wait_time.record(perf_counter_ns() - started)
+            if trace.enabled:
+                logger.debug('Acquired inputs for FB %s', fb.fb_id)
             await fb.exec(io_name, args)
-            logger.debug(f'Finished execution of FB {fb.fb_id}')
-        logger.debug(f'Released inputs for FB {fb.fb_id}')
+            if trace.enabled:
+                logger.debug('Finished execution of FB %s', fb.fb_id)
 
     def run_fb(self, io_name: str, fb: FB):
-        logger.debug(f'Running FB {fb.fb_id} via {io_name}')
-        self.tasks.append(asyncio.create_task(self.exec_fb(io_name, fb)))
+        if trace.enabled:
+            logger.debug('Running FB %s via %s', fb.fb_id, io_name)
+        self.spawn(self.exec_fb(io_name, fb))
+
+    def spawn(self, coro: Coroutine) -> Task:
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        self.idle.clear()
+        task.add_done_callback(self.reap_task)
+        return task
+
+    def reap_task(self, task: Task):
+        if task not in self.tasks:
+            return
+
+        self.tasks.remove(task)
+        if len(self.tasks) == 0:
+            self.idle.set()
+
+        if task.cancelled():
+            return
+
+        exc = task.exception()
+        if exc is not None:
+            self.record_failure(exc)
+
+    def record_failure(self, exc: BaseException):
+        self.failed_tasks += 1
+        self.errors.append(exc)
+        logger.error('FB task failed: %r', exc, exc_info=exc)
+
+    def can_run_inline(self, fb: FB) -> bool:
+        if not fb.desc.synchronous:
+            return False
+
+        available = self.table.available
+        for _, slot in self.get_plan(fb).inputs:
+            if not available[slot]:
+                return False
+
+        return True
+
+    async def dispatch(self):
+        try:
+            executed = 0
+            while self.pending:
+                if executed >= self.DISPATCH_BUDGET:
+                    executed = 0
+                    await asyncio.sleep(0)
+                    continue
+
+                io_name, fb = self.pending.popleft()
+                executed += 1
+
+                try:
+                    await self.exec_fb(io_name, fb)
+                except Exception as e:
+                    self.record_failure(e)
+        finally:
+            self.dispatching = False
 
     def trigger(self, via: Ref):
-        logger.debug('Processing trigger from %s.%s', via.fb_id, via.io_name)
+        if trace.enabled:
+            logger.debug('Processing trigger from %s.%s', via.fb_id, via.io_name)
+
+        fb = self.fb_index.get(via.fb_id)
+        if fb is None:
+            return
 
-        outputs = self.get_outputs(via)
-        if len(outputs) == 0:
+        targets = self.get_plan(fb).targets.get(via.io_name, ())
+        if trace.enabled and len(targets) == 0:
             logger.debug('No outputs found for trigger')
 
-        for conn in outputs:
-            target_fb = self.resolve_fb(conn.dst)
-            logger.debug('Dispatching trigger %s.%s -> %s.%s', via.fb_id, via.io_name, conn.dst.fb_id, conn.dst.io_name)
-            self.run_fb(conn.dst.io_name, target_fb)
+        for io_name, target_fb, conn in targets:
+            conn.triggers += 1
+            if trace.enabled:
+                logger.debug('Dispatching trigger %s.%s -> %s.%s', via.fb_id, via.io_name, target_fb.fb_id, io_name)
+
+            if self.can_run_inline(target_fb):
+                self.pending.append((io_name, target_fb))
+            else:
+                self.run_fb(io_name, target_fb)
+
+        if self.pending and not self.dispatching:
+            self.dispatching = True
+            self.spawn(self.dispatch())
 
     async def supply(self, via: Ref, value: any):
-        for conn in self.get_outputs(via):
-            logger.debug('Processing supply of %s from %s to %s', value, via, conn.dst)
-            await conn.value.supply(value)
+        fb = self.fb_index.get(via.fb_id)
+        if fb is None:
+            return
+
+        for conn in self.get_plan(fb).outputs.get(via.io_name, ()):
+            if trace.enabled:
+                logger.debug('Processing supply of %s from %s to %s', value, via, conn.dst)
+            conn.supplies += 1
+            self.table.supply(conn.slot, value)
@@ -0,0 +1,61 @@
+from typing import List
+
+from engine.desc import FbDesc, Ref
+
+
+class Deployment:
+    fbs: List[tuple[str, FbDesc]]
+    connections: List[tuple[Ref, Ref]]
+    inputs: List[tuple[Ref, any]]
+    replace: bool
+    descs: dict[str, FbDesc]
+
+    def __init__(self, replace: bool = False):
+        self.descs = {}
+        self.fbs = []
+        self.connections = []
+        self.inputs = []
+        self.replace = replace
+
+    def add_fb(self, fb_id: str, desc: FbDesc):
+        self.fbs.append((fb_id, desc))
+        self.descs[fb_id] = desc
+
+    def add_connection(self, src: Ref, dst: Ref):
+        self.connections.append((src, dst))
+
+    def add_input(self, dst: Ref, value: any):
+        self.inputs.append((dst, value))
+
+    def extend(self, deployment: 'Deployment'):
+        for fb_id, desc in deployment.fbs:
+            self.add_fb(fb_id, desc)
+
+        self.connections.extend(deployment.connections)
+        self.inputs.extend(deployment.inputs)
+
+    def get_staged(self, deployment: 'Deployment') -> dict[str, FbDesc]:
+        fb_ids = {fb_id for fb_id, _ in deployment.fbs}
+        fb_ids.update(ref.fb_id for conn in deployment.connections for ref in conn)
+        fb_ids.update(dst.fb_id for dst, _ in deployment.inputs)
+        return {fb_id: self.descs[fb_id] for fb_id in fb_ids if fb_id in self.descs}
+
+    def remove_fb(self, fb_id: str) -> bool:
+        if self.descs.pop(fb_id, None) is None:
+            return False
+
+        self.fbs = [(staged_id, desc) for staged_id, desc in self.fbs if staged_id != fb_id]
+        self.connections = [(src, dst) for src, dst in self.connections if fb_id not in (src.fb_id, dst.fb_id)]
+        self.inputs = [(dst, value) for dst, value in self.inputs if dst.fb_id != fb_id]
+        return True
+
+    def remove_connection(self, src: Ref, dst: Ref) -> bool:
+        connections = [conn for conn in self.connections if conn != (src, dst)]
+        if len(connections) == len(self.connections):
+            return False
+
+        self.connections = connections
+        return True
+
+    def __len__(self) -> int:
+        return len(self.fbs) + len(self.connections) + len(self.inputs)
@@ -1,8 +1,12 @@
 from asyncio import Event
 from typing import List
 
+from engine.timers import TimerService
+
 
 class Ref:
+    __slots__ = ('fb_id', 'io_name')
+
     fb_id: str
     io_name: str
 
@@ -10,6 +14,12 @@ class Ref:
         self.fb_id = fb_id
         self.io_name = io_name
 
+    def __eq__(self, other):
+        return isinstance(other, Ref) and self.fb_id == other.fb_id and self.io_name == other.io_name
+
+    def __hash__(self):
+        return hash((self.fb_id, self.io_name))
+
     def __str__(self):
         return f'Ref({self.fb_id}.{self.io_name})'
 
@@ -20,6 +30,8 @@ def parse_ref(io_id: str):
 
 
 class Lifecycle:
+    __slots__ = ('start',)
+
     start: Event
 
     def __init__(self, start_event: Event):
@@ -28,9 +40,11 @@ class Lifecycle:
 
 class Controller:
     context_lifecycle: Lifecycle
+    timers: TimerService
 
     def __init__(self, context_lifecycle: Lifecycle):
         self.context_lifecycle = context_lifecycle
+        self.timers = TimerService()
 
     def trigger(self, via: Ref):
         raise NotImplementedError()
@@ -40,37 +54,55 @@ class Controller:
 
 
 class ExecContext:
+    __slots__ = ('fb_id', 'io_name', 'controller', 'lifecycle', 'store', 'refs')
+
     fb_id: str
     io_name: str
     controller: Controller
     lifecycle: Lifecycle
     store: dict[str, any]
+    refs: dict[str, Ref]
 
-    def __init__(self, fb_id: str, io_name: str, controller: Controller, lifecycle: Lifecycle, store: dict[str, any]):
+    def __init__(self, fb_id: str, io_name: str, controller: Controller, lifecycle: Lifecycle, store: dict[str, any],
+                 refs: dict[str, Ref] | None = None):
         self.fb_id = fb_id
         self.io_name = io_name
         self.controller = controller
         self.lifecycle = lifecycle
         self.store = store
+        self.refs = {} if refs is None else refs
+
+    def ref(self, name: str) -> Ref:
+        ref = self.refs.get(name)
+        if ref is None:
+            ref = self.refs[name] = Ref(self.fb_id, name)
+
+        return ref
 
     async def supply_output(self, name: str, value: any):
-        await self.controller.supply(Ref(self.fb_id, name), value)
+        await self.controller.supply(self.ref(name), value)
 
     def trigger(self, name: str):
-        self.controller.trigger(Ref(self.fb_id, name))
+        self.controller.trigger(self.ref(name))
 
 class InputDesc:
+    __slots__ = ('name', 'kind', 'default_value', 'data_type')
+
     name: str
     kind: str
     default_value: any
+    data_type: str
 
-    def __init__(self, name: str, input_kind: str, default_value: any = None):
+    def __init__(self, name: str, input_kind: str, default_value: any = None, data_type: str = 'ANY'):
         self.name = name
         self.kind = input_kind
         self.default_value = default_value
+        self.data_type = data_type
 
 
 class OutputDesc:
+    __slots__ = ('name', 'kind')
+
     name: str
     kind: str
 
@@ -83,11 +115,22 @@ class FbDesc:
     name: str
     inputs: List[InputDesc]
     outputs: List[OutputDesc]
+    synchronous: bool
+    vectorized: bool
 
-    def __init__(self, name: str, inputs: List[InputDesc], outputs: List[OutputDesc]):
+    def __init__(self, name: str, inputs: List[InputDesc], outputs: List[OutputDesc], synchronous: bool = False,
+                 vectorized: bool = False):
         self.name = name
         self.inputs = inputs
         self.outputs = outputs
+        self.synchronous = synchronous
+        self.vectorized = vectorized
+
+    def get_input(self, name: str) -> InputDesc | None:
+        return next((i for i in self.inputs if i.name == name), None)
+
+    def get_output(self, name: str) -> OutputDesc | None:
+        return next((o for o in self.outputs if o.name == name), None)
 
     def get_value_inputs(self) -> List[InputDesc]:
         return list(filter(lambda i: i.kind == 'value', self.inputs))
@@ -1,9 +1,12 @@
 import logging
 
 from engine.desc import FbDesc, InputDesc, OutputDesc, ExecContext
+from engine.numeric import real
+from logs import get_tracer
 
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(logger)
 
 
 class ADD_3(FbDesc):
@@ -12,26 +15,30 @@ class ADD_3(FbDesc):
             name='ADD_3',
             inputs=[
                 InputDesc('REQ', 'event'),
-                InputDesc('IN1', 'value'),
-                InputDesc('IN2', 'value'),
-                InputDesc('IN3', 'value'),
+                InputDesc('IN1', 'value', data_type='REAL'),
+                InputDesc('IN2', 'value', data_type='REAL'),
+                InputDesc('IN3', 'value', data_type='REAL'),
             ],
             outputs=[
                 OutputDesc('CNF', 'event'),
                 OutputDesc('OUT', 'value'),
             ],
+            synchronous=True,
+            vectorized=True,
         )
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
         args = [
-            float(args['IN1']),
-            float(args['IN2']),
-            float(args['IN3']),
+            real(args['IN1']),
+            real(args['IN2']),
+            real(args['IN3']),
         ]
 
-        logger.debug('Evaluating expression %s', ' + '.join(map(str, args)))
+        if trace.enabled:
+            logger.debug('Evaluating expression %s', ' + '.join(map(str, args)))
         res = sum(args)
-        logger.debug('Got result: %s', res)
+        if trace.enabled:
+            logger.debug('Got result: %s', res)
 
         await context.supply_output('OUT', res)
         context.trigger('CNF')
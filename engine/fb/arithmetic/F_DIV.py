@@ -1,9 +1,12 @@
 import logging
 
 from engine.desc import FbDesc, InputDesc, OutputDesc, ExecContext
+from engine.numeric import real
+from logs import get_tracer
 
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(logger)
 
 
 class F_DIV(FbDesc):
@@ -12,24 +15,28 @@ class F_DIV(FbDesc):
             name='F_DIV',
             inputs=[
                 InputDesc('REQ', 'event'),
-                InputDesc('IN1', 'value'),
-                InputDesc('IN2', 'value'),
+                InputDesc('IN1', 'value', data_type='REAL'),
+                InputDesc('IN2', 'value', data_type='REAL'),
             ],
             outputs=[
                 OutputDesc('CNF', 'event'),
                 OutputDesc('OUT', 'value'),
             ],
+            synchronous=True,
+            vectorized=True,
         )
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
         args = [
-            float(args['IN1']),
-            float(args['IN2']),
+            real(args['IN1']),
+            real(args['IN2']),
         ]
 
-        logger.debug('Evaluating expression %s', ' / '.join(map(str, args)))
+        if trace.enabled:
+            logger.debug('Evaluating expression %s', ' / '.join(map(str, args)))
         res = args[0] / args[1]
-        logger.debug('Got result: %s', res)
+        if trace.enabled:
+            logger.debug('Got result: %s', res)
 
         await context.supply_output('OUT', res)
         context.trigger('CNF')
@@ -1,8 +1,10 @@
 import logging
 
 from engine.desc import FbDesc, InputDesc, OutputDesc, ExecContext
+from logs import get_tracer
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(logger)
 
 class F_LE(FbDesc):
     def __init__(self):
@@ -17,6 +19,8 @@ class F_LE(FbDesc):
                 OutputDesc('CNF', 'event'),
                 OutputDesc('OUT', 'value'),
             ],
+            synchronous=True,
+            vectorized=True,
         )
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
@@ -25,9 +29,11 @@ class F_LE(FbDesc):
             args['IN2'],
         ]
 
-        logger.debug('Evaluating expression %s', ' <= '.join(map(str, args)))
+        if trace.enabled:
+            logger.debug('Evaluating expression %s', ' <= '.join(map(str, args)))
         res = args[0] <= args[1]
-        logger.debug('Got result: %s', res)
+        if trace.enabled:
+            logger.debug('Got result: %s', res)
 
         await context.supply_output('OUT', res)
         context.trigger('CNF')
@@ -1,8 +1,10 @@
 import logging
 
 from engine.desc import FbDesc, OutputDesc, ExecContext, InputDesc
+from logs import get_tracer
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(logger)
 
 class BOOL2BOOL(FbDesc):
     def __init__(self):
@@ -10,16 +12,18 @@ class BOOL2BOOL(FbDesc):
             name='BOOL2BOOL',
             inputs=[
                 InputDesc('REQ', 'event'),
-                InputDesc('IN', 'value'),
+                InputDesc('IN', 'value', data_type='BOOL'),
             ],
             outputs=[
                 OutputDesc('CNF', 'event'),
                 OutputDesc('OUT', 'value')
             ],
+            synchronous=True,
         )
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
         res = bool(args['IN'])
-        logger.debug('Converted %s -> %t', args['IN'], res)
+        if trace.enabled:
+            logger.debug('Converted %s -> %s', args['IN'], res)
         await context.supply_output('OUT', res)
         context.trigger('CNF')
@@ -1,8 +1,10 @@
 import logging
 
 from engine.desc import FbDesc, OutputDesc, ExecContext, InputDesc
+from logs import get_tracer
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(logger)
 
 class INT2INT(FbDesc):
     def __init__(self):
@@ -10,16 +12,18 @@ class INT2INT(FbDesc):
             name='INT2INT',
             inputs=[
                 InputDesc('REQ', 'event'),
-                InputDesc('IN', 'value'),
+                InputDesc('IN', 'value', data_type='INT'),
             ],
             outputs=[
                 OutputDesc('CNF', 'event'),
                 OutputDesc('OUT', 'value')
             ],
+            synchronous=True,
         )
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
         res = int(args['IN'])
-        logger.debug('Converted %s -> %d', args['IN'], res)
+        if trace.enabled:
+            logger.debug('Converted %s -> %s', args['IN'], res)
         await context.supply_output('OUT', res)
         context.trigger('CNF')
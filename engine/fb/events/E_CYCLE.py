@@ -1,8 +1,7 @@
-import asyncio
 import logging
 
 from engine.desc import FbDesc, OutputDesc, ExecContext, InputDesc
-from utils import parse_duration
+from utils import duration
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +12,7 @@ class E_CYCLE(FbDesc):
             inputs=[
                 InputDesc(name='START', input_kind='event'),
                 InputDesc(name='STOP', input_kind='event'),
-                InputDesc(name='DT', input_kind='value'),
+                InputDesc(name='DT', input_kind='value', data_type='TIME'),
             ],
             outputs=[
                 OutputDesc(name='EO', output_kind='event'),
@@ -22,21 +21,14 @@ class E_CYCLE(FbDesc):
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
         if context.io_name == 'START':
-            if 'current_task' in context.store: return
-            delay = parse_duration(args['DT'])
+            if 'timer' in context.store: return
+            period = duration(args['DT'])
 
-            while True:
-                context.trigger('EO')
-                task = asyncio.create_task(asyncio.sleep(delay))
-                context.store['current_task'] = task
-                logger.debug('Sleeping for %s seconds', delay)
-
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    logger.debug('Task cancelled')
-                    return
+            context.trigger('EO')
+            context.store['timer'] = context.controller.timers.call_every(period, lambda: context.trigger('EO'))
+            logger.debug('Cycling every %s seconds', period)
 
         if context.io_name == 'STOP':
-            if 'current_task' not in context.store: return
-            context.store['current_task'].cancel()
+            if 'timer' not in context.store: return
+            context.store.pop('timer').cancel()
+            logger.debug('Cycle stopped')
@@ -1,8 +1,7 @@
-import asyncio
 import logging
 
 from engine.desc import FbDesc, OutputDesc, ExecContext, InputDesc
-from utils import parse_duration
+from utils import duration
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +12,7 @@ class E_DELAY(FbDesc):
             inputs=[
                 InputDesc(name='START', input_kind='event'),
                 InputDesc(name='STOP', input_kind='event'),
-                InputDesc(name='DT', input_kind='value'),
+                InputDesc(name='DT', input_kind='value', data_type='TIME'),
             ],
             outputs=[
                 OutputDesc(name='EO', output_kind='event'),
@@ -22,20 +21,17 @@ class E_DELAY(FbDesc):
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
         if context.io_name == 'START':
-            if 'current_task' in context.store: return
-            delay = parse_duration(args['DT'])
+            if 'timer' in context.store: return
+            delay = duration(args['DT'])
 
-            task = asyncio.create_task(asyncio.sleep(delay))
-            context.store['current_task'] = task
-            logger.debug('Sleeping for %s seconds', delay)
-
-            try:
-                await task
+            def fire():
+                del context.store['timer']
                 context.trigger('EO')
-            except asyncio.CancelledError:
-                logger.debug('Task cancelled')
-                return
+
+            context.store['timer'] = context.controller.timers.call_later(delay, fire)
+            logger.debug('Delaying for %s seconds', delay)
 
         if context.io_name == 'STOP':
-            if 'current_task' not in context.store: return
-            context.store['current_task'].cancel()
+            if 'timer' not in context.store: return
+            context.store.pop('timer').cancel()
+            logger.debug('Delay cancelled')
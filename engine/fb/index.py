@@ -11,6 +11,7 @@ class UnsupportedBlockException(Exception):
     block_name: str
 
     def __init__(self, block_name: str):
+        super().__init__(block_name)
         self.block_name = block_name
 
 
@@ -7,14 +7,16 @@ class OUT_ANY_CONSOLE(FbDesc):
             name='OUT_ANY_CONSOLE',
             inputs=[
                 InputDesc('REQ', 'event'),
-                InputDesc('QI', 'value', True),
-                InputDesc('LABEL', 'value', ''),
+                InputDesc('QI', 'value', True, 'BOOL'),
+                InputDesc('LABEL', 'value', '', 'STRING'),
                 InputDesc('IN', 'value', ''),
             ],
             outputs=[
                 OutputDesc('CNF', 'event'),
                 OutputDesc('QO', 'value'),
             ],
+            synchronous=True,
+            vectorized=True,
         )
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
@@ -10,11 +10,12 @@ class TEST_CONDITION(FbDesc):
             name='TEST_CONDITION',
             inputs=[
                 InputDesc('REQ', 'event'),
-                InputDesc('check', 'value', False),
+                InputDesc('check', 'value', False, 'BOOL'),
             ],
             outputs=[
                 OutputDesc('CNF', 'event'),
             ],
+            synchronous=True,
         )
 
     async def exec(self, context: ExecContext, args: dict[str, any]):
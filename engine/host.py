@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from asyncio import AbstractEventLoop
+from concurrent.futures import Future
+from threading import Thread
+from typing import List, Coroutine
+
+from engine.core import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class LoopThread(Thread):
+    loop: AbstractEventLoop
+    engine_count: int
+
+    def __init__(self, name: str):
+        super().__init__(name=name, daemon=True)
+        self.loop = asyncio.new_event_loop()
+        self.engine_count = 0
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        logger.debug('Event loop %s is running', self.name)
+
+        try:
+            self.loop.run_forever()
+        finally:
+            self.cancel_tasks()
+            self.loop.close()
+
+    def cancel_tasks(self):
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+
+        if len(tasks) > 0:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class RuntimeHost:
+    loops: List[LoopThread]
+
+    def __init__(self, loop_count: int = 1):
+        self.loops = [LoopThread(f'engine-loop-{i}') for i in range(max(loop_count, 1))]
+
+        for loop in self.loops:
+            loop.start()
+
+        logger.info('Runtime host started with %d event loops', len(self.loops))
+
+    def run(self, coro: Coroutine) -> any:
+        return self.loops[0].submit(coro).result()
+
+    def start_engine(self, resource_name: str, engine: Engine) -> Future:
+        loop = min(self.loops, key=lambda l: l.engine_count)
+        loop.engine_count += 1
+        engine.loop = loop.loop
+
+        def on_done(future: Future):
+            loop.engine_count -= 1
+
+            if future.cancelled():
+                logger.info('Engine %s was cancelled', resource_name)
+            elif future.exception() is not None:
+                logger.error('Engine %s failed', resource_name, exc_info=future.exception())
+            else:
+                logger.info('Engine %s finished', resource_name)
+
+        future = loop.submit(engine.run())
+        future.add_done_callback(on_done)
+        logger.info('Scheduled engine %s on %s', resource_name, loop.name)
+
+        return future
+
+    def shutdown(self):
+        alive = [loop for loop in self.loops if loop.is_alive()]
+
+        for loop in alive:
+            loop.stop()
+
+        for loop in alive:
+            loop.join()
@@ -0,0 +1,126 @@
+import re
+
+from utils import parse_duration
+
+INT_TYPES = {'SINT', 'INT', 'DINT', 'LINT', 'USINT', 'UINT', 'UDINT', 'ULINT', 'BYTE', 'WORD', 'DWORD', 'LWORD'}
+REAL_TYPES = {'REAL', 'LREAL'}
+STRING_TYPES = {'STRING', 'WSTRING', 'CHAR', 'WCHAR'}
+TIME_TYPES = {'TIME', 'LTIME', 'T', 'LT'}
+KNOWN_TYPES = INT_TYPES | REAL_TYPES | STRING_TYPES | TIME_TYPES | {'BOOL'}
+
+TYPED_LITERAL = re.compile(r'^([A-Za-z_]+)#(.*)$', re.DOTALL)
+BASED_LITERAL = re.compile(r'^[+-]?\d+#')
+INT_LITERAL = re.compile(r'^[+-]?(?:\d+|2#[01]+|8#[0-7]+|16#[0-9A-Fa-f]+)$')
+REAL_LITERAL = re.compile(r'^[+-]?(?:\d+\.\d+(?:[eE][+-]?\d+)?|\d+[eE][+-]?\d+)$')
+STRING_ESCAPES = {
+    '$': '$',
+    "'": "'",
+    '"': '"',
+    'L': '\n',
+    'N': '\n',
+    'P': '\f',
+    'R': '\r',
+    'T': '\t',
+}
+
+
+def parse_literal(text: str, data_type: str = 'ANY') -> any:
+    literal = text.strip()
+    data_type = data_type.upper()
+
+    match = TYPED_LITERAL.match(literal)
+    if match is not None and data_type not in STRING_TYPES:
+        prefix = match.group(1).upper()
+        if prefix in TIME_TYPES:
+            return parse_duration(literal)
+
+        if prefix in KNOWN_TYPES:
+            data_type, literal = prefix, match.group(2)
+    elif match is not None and match.group(1).upper() in STRING_TYPES:
+        literal = match.group(2)
+
+    if data_type in INT_TYPES:
+        return parse_int(literal)
+    if data_type in REAL_TYPES:
+        return float(literal.replace('_', ''))
+    if data_type == 'BOOL':
+        return parse_bool(literal)
+    if data_type in STRING_TYPES:
+        return parse_string(literal)
+    if data_type in TIME_TYPES:
+        return parse_duration(literal)
+
+    return infer_literal(literal)
+
+
+def infer_literal(literal: str) -> any:
+    plain = literal.replace('_', '')
+
+    if literal.upper() in ('TRUE', 'FALSE'):
+        return parse_bool(literal)
+    if literal[:1] in ('\'', '"'):
+        return parse_string(literal)
+    if INT_LITERAL.match(plain) or BASED_LITERAL.match(plain):
+        return parse_int(plain)
+    if REAL_LITERAL.match(plain):
+        return float(plain)
+
+    return literal
+
+
+def parse_int(literal: str) -> int:
+    plain = literal.replace('_', '')
+    sign = -1 if plain.startswith('-') else 1
+    plain = plain.lstrip('+-')
+
+    if '#' in plain:
+        base, digits = plain.split('#', 1)
+        return sign * int(digits, int(base))
+
+    return sign * int(plain)
+
+
+def parse_bool(literal: str) -> bool:
+    value = literal.upper()
+    if value in ('TRUE', '1'):
+        return True
+    if value in ('FALSE', '0'):
+        return False
+
+    raise ValueError(f'Invalid BOOL literal {literal!r}')
+
+
+def is_quoted(literal: str) -> bool:
+    return len(literal) >= 2 and literal[0] == literal[-1] and literal[0] in ('\'', '"')
+
+
+def parse_string(literal: str) -> str:
+    if not is_quoted(literal):
+        if literal[:1] in ('\'', '"'):
+            raise ValueError(f'Unterminated STRING literal {literal!r}')
+        return literal
+
+    body = literal[1:-1]
+    if '$' not in body:
+        return body
+
+    res = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char != '$' or i + 1 == len(body):
+            res.append(char)
+            i += 1
+            continue
+
+        code = body[i + 1]
+        if code.upper() in STRING_ESCAPES:
+            res.append(STRING_ESCAPES[code.upper()])
+            i += 2
+        elif i + 2 < len(body):
+            res.append(chr(int(body[i + 1:i + 3], 16)))
+            i += 3
+        else:
+            raise ValueError(f'Invalid STRING literal {literal!r}')
+
+    return ''.join(res)
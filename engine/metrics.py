@@ -0,0 +1,107 @@
+from typing import List
+
+HISTOGRAM_BUCKETS = 40
+
+
+class Histogram:
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    count: int
+    total: int
+    max: int
+    buckets: dict[int, int]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = {}
+
+    def record(self, value: int):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+        index = min(value.bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, fraction: float) -> int:
+        if self.count == 0:
+            return 0
+
+        rank = fraction * self.count
+        seen = 0
+        for index, hits in sorted(self.buckets.items()):
+            seen += hits
+            if seen >= rank:
+                return min(1 << index, self.max)
+
+        return self.max
+
+    def bucket_counts(self) -> List[tuple[int, int]]:
+        return [(1 << index, hits) for index, hits in sorted(self.buckets.items())]
+
+    def copy(self) -> 'Histogram':
+        histogram = Histogram()
+        histogram.count = self.count
+        histogram.total = self.total
+        histogram.max = self.max
+        histogram.buckets = dict(self.buckets)
+        return histogram
+
+
+class FbMetrics:
+    __slots__ = ('executions', 'failures', 'exec_time', 'wait_time')
+
+    executions: int
+    failures: int
+    exec_time: Histogram
+    wait_time: Histogram
+
+    def __init__(self):
+        self.executions = 0
+        self.failures = 0
+        self.exec_time = Histogram()
+        self.wait_time = Histogram()
+
+    def copy(self) -> 'FbMetrics':
+        metrics = FbMetrics()
+        metrics.executions = self.executions
+        metrics.failures = self.failures
+        metrics.exec_time = self.exec_time.copy()
+        metrics.wait_time = self.wait_time.copy()
+        return metrics
+
+
+class FbStats:
+    fb_id: str
+    fb_type: str
+    metrics: FbMetrics
+
+    def __init__(self, fb_id: str, fb_type: str, metrics: FbMetrics):
+        self.fb_id = fb_id
+        self.fb_type = fb_type
+        self.metrics = metrics
+
+
+class ConnectionStats:
+    source: str
+    destination: str
+    supplies: int
+    triggers: int
+
+    def __init__(self, source: str, destination: str, supplies: int, triggers: int):
+        self.source = source
+        self.destination = destination
+        self.supplies = supplies
+        self.triggers = triggers
+
+
+class EngineMetrics:
+    fbs: List[FbStats]
+    connections: List[ConnectionStats]
+
+    def __init__(self, fbs: List[FbStats], connections: List[ConnectionStats]):
+        self.fbs = fbs
+        self.connections = connections
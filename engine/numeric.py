@@ -0,0 +1,26 @@
+import numpy
+from numpy import ndarray
+
+
+def real(value: any) -> any:
+    if type(value) is float:
+        return value
+
+    if isinstance(value, ndarray):
+        return value.astype(numpy.float64, copy=False)
+
+    return float(value)
+
+
+def maximum(a: any, b: any) -> any:
+    if isinstance(a, ndarray) or isinstance(b, ndarray):
+        return numpy.maximum(a, b)
+
+    return max(a, b)
+
+
+def minimum(a: any, b: any) -> any:
+    if isinstance(a, ndarray) or isinstance(b, ndarray):
+        return numpy.minimum(a, b)
+
+    return min(a, b)
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from threading import Lock
+from typing import List
+
+from engine.deploy import Deployment
+from engine.desc import FbDesc, Ref
+from engine.fb import fb_index
+from engine.host import RuntimeHost
+from engine.metrics import EngineMetrics
+from engine.store import EngineStore, NoSuchResourceException, AlreadyExistsException
+from logs import setup_logging, WORKER_LOG_FORMAT
+
+logger = logging.getLogger(__name__)
+
+
+def worker_main(conn: Connection, loop_count: int, batch_instances: int):
+    log_listener = setup_logging(WORKER_LOG_FORMAT)
+    engines = EngineStore(RuntimeHost(loop_count), batch_instances)
+
+    try:
+        asyncio.run(serve_worker(conn, engines))
+    finally:
+        engines.shutdown()
+        log_listener.stop()
+
+
+async def serve_worker(conn: Connection, engines: EngineStore):
+    loop = asyncio.get_running_loop()
+
+    while True:
+        try:
+            command, resource_name, args = await loop.run_in_executor(None, conn.recv)
+        except EOFError:
+            break
+
+        if command == 'shutdown':
+            break
+
+        try:
+            if command in ('commit', 'redeploy'):
+                args = (load_deployment(*args, replace=command == 'redeploy'),)
+            elif command == 'check':
+                *deployment, replace, staged = args
+                args = (load_deployment(*deployment, replace=replace),
+                        {fb_id: fb_index.resolve(desc_name) for fb_id, desc_name in staged.items()})
+
+            result = await getattr(engines, command)(resource_name, *args)
+            conn.send((True, result))
+        except Exception as e:
+            conn.send((False, e))
+
+
+def load_deployment(fbs: List[tuple[str, str]], connections: List[tuple[Ref, Ref]], inputs: List[tuple[Ref, any]],
+                    replace: bool = False) -> Deployment:
+    deployment = Deployment(replace)
+    for fb_id, desc_name in fbs:
+        deployment.add_fb(fb_id, fb_index.resolve(desc_name))
+    deployment.connections = connections
+    deployment.inputs = inputs
+    return deployment
+
+
+def dump_deployment(deployment: Deployment) -> tuple:
+    fbs = [(fb_id, desc.name) for fb_id, desc in deployment.fbs]
+    return fbs, deployment.connections, deployment.inputs
+
+
+class Worker:
+    name: str
+    process: BaseProcess
+    conn: Connection
+    lock: Lock
+    executor: ThreadPoolExecutor
+    resources: set[str]
+
+    def __init__(self, name: str, loop_count: int, batch_instances: int):
+        ctx = multiprocessing.get_context('spawn')
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=worker_main,
+            args=(child_conn, loop_count, batch_instances),
+            name=name,
+            daemon=True,
+        )
+        self.name = name
+        self.lock = Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self.resources = set()
+
+        self.process.start()
+        child_conn.close()
+
+    async def call(self, command: str, resource_name: str, *args) -> any:
+        loop = asyncio.get_running_loop()
+        ok, result = await loop.run_in_executor(self.executor, self.exchange, (command, resource_name, args))
+
+        if not ok:
+            raise result
+
+        return result
+
+    def exchange(self, message: tuple) -> tuple[bool, any]:
+        with self.lock:
+            self.conn.send(message)
+            return self.conn.recv()
+
+    def shutdown(self):
+        self.executor.shutdown()
+        if not self.process.is_alive():
+            return
+
+        with self.lock:
+            self.conn.send(('shutdown', '', ()))
+
+        self.process.join()
+
+
+class EngineProxy:
+    resource_name: str
+    worker: Worker
+    resource_type: str
+
+    def __init__(self, resource_name: str, worker: Worker, resource_type: str):
+        self.resource_name = resource_name
+        self.worker = worker
+        self.resource_type = resource_type
+
+
+class ShardedEngineStore:
+    workers: List[Worker]
+    engines: dict[str, EngineProxy]
+
+    def __init__(self, worker_count: int, loop_count: int = 1, batch_instances: int = 0):
+        self.workers = [Worker(f'engine-worker-{i}', loop_count, batch_instances) for i in range(max(worker_count, 1))]
+        self.engines = {}
+        logger.info('Started %d engine worker processes', len(self.workers))
+
+    async def create_engine(self, resource_name: str, batched: bool = False):
+        if resource_name in self.engines:
+            raise AlreadyExistsException(resource_name)
+
+        worker = min(self.workers, key=lambda w: len(w.resources))
+        await worker.call('create_engine', resource_name, batched)
+        worker.resources.add(resource_name)
+
+        self.engines[resource_name] = EngineProxy(resource_name, worker, 'BATCH_RES' if batched else 'EMB_RES')
+        logger.info(f'Created engine {resource_name} on {worker.name}')
+
+    async def delete_engine(self, resource_name: str):
+        proxy = self.get_engine(resource_name)
+        await proxy.worker.call('delete_engine', resource_name)
+        proxy.worker.resources.discard(resource_name)
+
+        del self.engines[resource_name]
+        logger.info(f'Deleted engine {resource_name}')
+
+    async def start_engine(self, resource_name: str):
+        await self.get_engine(resource_name).worker.call('start_engine', resource_name)
+
+    async def stop_engine(self, resource_name: str):
+        await self.get_engine(resource_name).worker.call('stop_engine', resource_name)
+
+    async def kill_engine(self, resource_name: str):
+        await self.get_engine(resource_name).worker.call('kill_engine', resource_name)
+
+    async def reset_engine(self, resource_name: str):
+        await self.get_engine(resource_name).worker.call('reset_engine', resource_name)
+
+    async def is_running(self, resource_name: str) -> bool:
+        return await self.get_engine(resource_name).worker.call('is_running', resource_name)
+
+    async def check(self, resource_name: str, deployment: Deployment, staged: dict[str, FbDesc]):
+        staged = {fb_id: desc.name for fb_id, desc in staged.items()}
+        await self.get_engine(resource_name).worker.call('check', resource_name, *dump_deployment(deployment),
+                                                         deployment.replace, staged)
+
+    async def commit(self, resource_name: str, deployment: Deployment):
+        await self.get_engine(resource_name).worker.call('commit', resource_name, *dump_deployment(deployment))
+
+    async def redeploy(self, resource_name: str, deployment: Deployment):
+        await self.get_engine(resource_name).worker.call('redeploy', resource_name, *dump_deployment(deployment))
+
+    async def remove_fb(self, resource_name: str, fb_id: str):
+        await self.get_engine(resource_name).worker.call('remove_fb', resource_name, fb_id)
+
+    async def disconnect(self, resource_name: str, src: Ref, dst: Ref):
+        await self.get_engine(resource_name).worker.call('disconnect', resource_name, src, dst)
+
+    async def metrics(self, resource_name: str, fb_ids: List[str] | None = None) -> EngineMetrics:
+        return await self.get_engine(resource_name).worker.call('metrics', resource_name, fb_ids)
+
+    def get_engine(self, resource_name: str) -> EngineProxy:
+        if resource_name not in self.engines:
+            raise NoSuchResourceException(resource_name)
+
+        return self.engines[resource_name]
+
+    def get_engines(self) -> dict[str, EngineProxy]:
+        return self.engines
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.shutdown()
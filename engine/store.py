@@ -1,6 +1,13 @@
 import logging
+from typing import List
 
+from engine.batch import BatchEngine
 from engine.core import Engine
+from engine.deploy import Deployment
+from engine.desc import FbDesc, Ref
+from engine.fb import UnsupportedBlockException
+from engine.host import RuntimeHost
+from engine.metrics import EngineMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +15,7 @@ class NoSuchResourceException(Exception):
     resource_name: str
 
     def __init__(self, resource_name: str):
+        super().__init__(resource_name)
         self.resource_name = resource_name
 
 
@@ -15,28 +23,99 @@ class AlreadyExistsException(Exception):
     resource_name: str
 
     def __init__(self, resource_name: str):
+        super().__init__(resource_name)
+        self.resource_name = resource_name
+
+
+class InvalidStateException(Exception):
+    resource_name: str
+
+    def __init__(self, resource_name: str):
+        super().__init__(resource_name)
         self.resource_name = resource_name
 
 
 class EngineStore:
     engines: dict[str, Engine]
+    host: RuntimeHost
+    batch_instances: int
 
-    def __init__(self):
+    def __init__(self, host: RuntimeHost, batch_instances: int = 0):
         self.engines = {}
+        self.host = host
+        self.batch_instances = batch_instances
 
-    def create_engine(self, resource_name: str):
+    async def create_engine(self, resource_name: str, batched: bool = False):
         if resource_name in self.engines:
             raise AlreadyExistsException(resource_name)
 
-        self.engines[resource_name] = Engine()
-        logger.info(f'Created engine {resource_name}')
+        if batched:
+            if self.batch_instances <= 0:
+                raise UnsupportedBlockException('BATCH_RES')
 
-    def delete_engine(self, resource_name: str):
-        if resource_name in self.engines:
-            del self.engines[resource_name]
-            logger.info(f'Deleted engine {resource_name}')
+            self.engines[resource_name] = BatchEngine(self.batch_instances)
+            logger.info(f'Created batch engine {resource_name} with {self.batch_instances} instances')
         else:
-            raise NoSuchResourceException(resource_name)
+            self.engines[resource_name] = Engine()
+            logger.info(f'Created engine {resource_name}')
+
+    async def delete_engine(self, resource_name: str):
+        engine = self.get_engine(resource_name)
+        del self.engines[resource_name]
+
+        await engine.execute(engine.release)
+        logger.info(f'Deleted engine {resource_name}')
+
+    async def start_engine(self, resource_name: str):
+        engine = self.get_engine(resource_name)
+
+        if engine.running:
+            raise InvalidStateException(resource_name)
+
+        self.host.start_engine(resource_name, engine)
+
+    async def stop_engine(self, resource_name: str):
+        engine = self.get_running_engine(resource_name)
+        await engine.execute(engine.stop)
+
+    async def kill_engine(self, resource_name: str):
+        engine = self.get_running_engine(resource_name)
+        await engine.execute(engine.kill)
+
+    async def reset_engine(self, resource_name: str):
+        engine = self.get_engine(resource_name)
+
+        if engine.running:
+            raise InvalidStateException(resource_name)
+
+        await engine.execute(engine.reset)
+
+    async def is_running(self, resource_name: str) -> bool:
+        return self.get_engine(resource_name).running
+
+    async def check(self, resource_name: str, deployment: Deployment, staged: dict[str, FbDesc]):
+        engine = self.get_engine(resource_name)
+        await engine.execute(engine.check, deployment, staged)
+
+    async def commit(self, resource_name: str, deployment: Deployment):
+        engine = self.get_engine(resource_name)
+        await engine.execute(engine.commit, deployment)
+
+    async def redeploy(self, resource_name: str, deployment: Deployment):
+        engine = self.get_engine(resource_name)
+        await engine.execute(engine.redeploy, deployment)
+
+    async def remove_fb(self, resource_name: str, fb_id: str):
+        engine = self.get_engine(resource_name)
+        await engine.execute(engine.remove_fb, fb_id)
+
+    async def disconnect(self, resource_name: str, src: Ref, dst: Ref):
+        engine = self.get_engine(resource_name)
+        await engine.execute(engine.disconnect, src, dst)
+
+    async def metrics(self, resource_name: str, fb_ids: List[str] | None = None) -> EngineMetrics:
+        engine = self.get_engine(resource_name)
+        return await engine.execute(engine.metrics, fb_ids)
 
     def get_engine(self, resource_name: str) -> Engine:
         if resource_name not in self.engines:
@@ -44,5 +123,20 @@ class EngineStore:
 
         return self.engines[resource_name]
 
+    def get_running_engine(self, resource_name: str) -> Engine:
+        engine = self.get_engine(resource_name)
+
+        if not engine.running:
+            raise InvalidStateException(resource_name)
+
+        return engine
+
     def get_engines(self) -> dict[str, Engine]:
         return self.engines
+
+    def shutdown(self):
+        for engine in self.engines.values():
+            engine.release()
+
+        self.engines.clear()
+        self.host.shutdown()
@@ -0,0 +1,126 @@
+import asyncio
+from array import array
+from asyncio import Future
+from typing import List
+
+INITIAL_CAPACITY = 64
+
+
+class ValueSnapshot:
+    __slots__ = ('current', 'available', 'generation')
+
+    current: List[any]
+    available: bytes
+    generation: array
+
+    def __init__(self, current: List[any], available: bytes, generation: array):
+        self.current = current
+        self.available = available
+        self.generation = generation
+
+
+class ValueTable:
+    __slots__ = ('current', 'available', 'generation', 'waiters', 'size', 'free')
+
+    current: List[any]
+    available: bytearray
+    generation: array
+    waiters: dict[int, List[Future]]
+    size: int
+    free: List[int]
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.current = [None] * capacity
+        self.available = bytearray(capacity)
+        self.generation = array('Q', bytes(8 * capacity))
+        self.waiters = {}
+        self.size = 0
+        self.free = []
+
+    @property
+    def capacity(self) -> int:
+        return len(self.current)
+
+    def allocate(self, value: any = None, available: bool = False) -> int:
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.size == self.capacity:
+                self.grow()
+            slot = self.size
+            self.size += 1
+
+        self.current[slot] = value
+        self.available[slot] = available
+        self.generation[slot] = 1 if available else 0
+        return slot
+
+    def release(self, slot: int):
+        self.current[slot] = None
+        self.available[slot] = False
+        self.generation[slot] = 0
+        self.free.append(slot)
+
+        for waiter in self.waiters.pop(slot, ()):
+            waiter.cancel()
+
+    def grow(self):
+        extra = self.capacity
+        self.current.extend([None] * extra)
+        self.available.extend(bytes(extra))
+        self.generation.frombytes(bytes(8 * extra))
+
+    def supply(self, slot: int, value: any) -> int:
+        self.current[slot] = value
+        self.available[slot] = True
+        self.generation[slot] += 1
+
+        waiters = self.waiters.pop(slot, None)
+        if waiters is None:
+            return 0
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(value)
+
+        return len(waiters)
+
+    async def acquire(self, slot: int) -> any:
+        if self.available[slot]:
+            return self.current[slot]
+
+        return await self.next(slot)
+
+    async def next(self, slot: int) -> any:
+        waiter = asyncio.get_running_loop().create_future()
+
+        waiters = self.waiters.get(slot)
+        if waiters is None:
+            self.waiters[slot] = [waiter]
+        else:
+            waiters.append(waiter)
+
+        return await waiter
+
+    def reset(self, slot: int):
+        self.current[slot] = None
+        self.available[slot] = False
+        self.generation[slot] = 0
+
+    def cancel_waiters(self):
+        for waiters in self.waiters.values():
+            for waiter in waiters:
+                waiter.cancel()
+
+        self.waiters.clear()
+
+    def clear(self):
+        self.cancel_waiters()
+        self.current[:] = [None] * self.capacity
+        self.available[:] = bytes(self.capacity)
+        self.generation = array('Q', bytes(8 * self.capacity))
+        self.size = 0
+        self.free.clear()
+
+    def snapshot(self) -> ValueSnapshot:
+        return ValueSnapshot(self.current[:self.size], bytes(self.available[:self.size]), self.generation[:self.size])
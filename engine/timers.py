@@ -0,0 +1,204 @@
+import asyncio
+import heapq
+import logging
+from asyncio import AbstractEventLoop, Event, TimerHandle
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    service: 'TimerService'
+    callback: Callable[[], None]
+    group: 'TimerGroup | None'
+    cancelled: bool
+
+    def __init__(self, service: 'TimerService', callback: Callable[[], None], group: 'TimerGroup | None' = None):
+        self.service = service
+        self.callback = callback
+        self.group = group
+        self.cancelled = False
+
+    def cancel(self):
+        self.service.cancel(self)
+
+
+class TimerGroup:
+    period: float
+    deadline: float
+    members: List[Timer]
+
+    def __init__(self, period: float, deadline: float):
+        self.period = period
+        self.deadline = deadline
+        self.members = []
+
+
+class TimerService:
+    PHASE_TOLERANCE = 0.001
+
+    loop: AbstractEventLoop | None
+    heap: List[tuple[float, int, Timer | TimerGroup]]
+    groups: dict[float, List[TimerGroup]]
+    handle: TimerHandle | None
+    armed_at: float | None
+    active: int
+    idle: Event
+    last_seq: int
+
+    def __init__(self):
+        self.loop = None
+        self.heap = []
+        self.groups = {}
+        self.handle = None
+        self.armed_at = None
+        self.active = 0
+        self.idle = Event()
+        self.idle.set()
+        self.last_seq = 0
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Timer:
+        timer = Timer(self, callback)
+        self.push(self.get_loop().time() + delay, timer)
+        self.acquire()
+        return timer
+
+    def call_every(self, period: float, callback: Callable[[], None]) -> Timer:
+        if period <= 0:
+            raise ValueError(f'Timer period must be positive, got {period}')
+
+        deadline = self.get_loop().time() + period
+        group = self.find_group(period, deadline)
+        if group is None:
+            group = TimerGroup(period, deadline)
+            self.groups.setdefault(period, []).append(group)
+            self.push(group.deadline, group)
+            logger.debug('Created timer group with period %s', period)
+
+        timer = Timer(self, callback, group)
+        group.members.append(timer)
+        self.acquire()
+        return timer
+
+    def cancel(self, timer: Timer):
+        if timer.cancelled:
+            return
+
+        timer.cancelled = True
+        self.release()
+
+        group = timer.group
+        if group is None:
+            return
+
+        group.members.remove(timer)
+        if len(group.members) == 0:
+            self.remove_group(group)
+
+    def clear(self):
+        for _, _, entry in self.heap:
+            for timer in entry.members if isinstance(entry, TimerGroup) else (entry,):
+                timer.cancelled = True
+                timer.group = None
+
+            if isinstance(entry, TimerGroup):
+                entry.members.clear()
+
+        self.heap.clear()
+        self.groups.clear()
+        self.active = 0
+        self.idle.set()
+
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = self.armed_at = None
+
+    def find_group(self, period: float, deadline: float) -> TimerGroup | None:
+        for group in self.groups.get(period, ()):
+            offset = (deadline - group.deadline) % period
+            if min(offset, period - offset) <= self.PHASE_TOLERANCE:
+                return group
+
+        return None
+
+    def remove_group(self, group: TimerGroup):
+        groups = self.groups.get(group.period, [])
+        if group in groups:
+            groups.remove(group)
+        if len(groups) == 0:
+            self.groups.pop(group.period, None)
+
+    def get_loop(self) -> AbstractEventLoop:
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+
+        return self.loop
+
+    def acquire(self):
+        self.active += 1
+        self.idle.clear()
+
+    def release(self):
+        self.active -= 1
+        if self.active == 0:
+            self.idle.set()
+
+    def push(self, deadline: float, entry: Timer | TimerGroup):
+        self.last_seq += 1
+        heapq.heappush(self.heap, (deadline, self.last_seq, entry))
+        self.arm()
+
+    def arm(self):
+        if len(self.heap) == 0:
+            return
+
+        deadline = self.heap[0][0]
+        if self.armed_at is not None and self.armed_at <= deadline:
+            return
+
+        if self.handle is not None:
+            self.handle.cancel()
+
+        self.handle = self.get_loop().call_at(deadline, self.fire)
+        self.armed_at = deadline
+
+    def fire(self):
+        self.handle = self.armed_at = None
+        now = self.loop.time()
+
+        while self.heap and self.heap[0][0] <= now:
+            deadline, _, entry = heapq.heappop(self.heap)
+
+            if isinstance(entry, TimerGroup):
+                self.fire_group(entry, now)
+            elif not entry.cancelled:
+                entry.cancelled = True
+                self.release()
+                self.run(entry)
+
+        self.arm()
+
+    def fire_group(self, group: TimerGroup, now: float):
+        if len(group.members) == 0:
+            return
+
+        for timer in tuple(group.members):
+            if not timer.cancelled:
+                self.run(timer)
+
+        if len(group.members) == 0:
+            return
+
+        group.deadline += group.period
+        if group.deadline <= now:
+            skipped = int((now - group.deadline) // group.period) + 1
+            group.deadline += skipped * group.period
+            logger.warning('Timer group with period %s overran, skipped %d ticks', group.period, skipped)
+
+        self.push(group.deadline, group)
+
+    def run(self, timer: Timer):
+        try:
+            timer.callback()
+        except Exception:
+            logger.exception('Timer callback failed')
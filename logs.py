@@ -0,0 +1,70 @@
+import logging
+import sys
+from logging import Logger
+from logging.handlers import QueueHandler, QueueListener
+from os import getenv
+from queue import SimpleQueue
+from typing import List
+
+LOG_FORMAT = '%(asctime)s | %(module)-10s | %(levelname)-5s | %(message)s'
+WORKER_LOG_FORMAT = '%(asctime)s | %(processName)-10s | %(module)-10s | %(levelname)-5s | %(message)s'
+
+
+class Tracer:
+    logger: Logger
+    enabled: bool
+
+    def __init__(self, logger: Logger):
+        self.logger = logger
+        self.refresh()
+
+    def refresh(self):
+        self.enabled = self.logger.isEnabledFor(logging.DEBUG)
+
+
+tracers: List[Tracer] = []
+
+
+def get_tracer(logger: Logger) -> Tracer:
+    tracer = Tracer(logger)
+    tracers.append(tracer)
+    return tracer
+
+
+def refresh_tracers():
+    for tracer in tracers:
+        tracer.refresh()
+
+
+def parse_levels(spec: str) -> dict[str, str]:
+    levels = {}
+
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+
+        name, level = item.split('=', 1)
+        levels[name.strip()] = level.strip().upper()
+
+    return levels
+
+
+def setup_logging(log_format: str = LOG_FORMAT) -> QueueListener:
+    queue = SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(log_format))
+
+    root = logging.getLogger()
+    for old_handler in root.handlers[:]:
+        root.removeHandler(old_handler)
+    root.addHandler(QueueHandler(queue))
+    root.setLevel(getenv('LOG_LEVEL', 'INFO').upper())
+
+    for name, level in parse_levels(getenv('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = QueueListener(queue, handler)
+    listener.start()
+
+    refresh_tracers()
+    return listener
@@ -1,25 +1,40 @@
-import asyncio
 import logging
-import sys
 from os import getenv
 
-from engine import EngineStore
+from engine import EngineStore, RuntimeHost, ShardedEngineStore
+from logs import setup_logging
 from server import Listener
 
 
-async def main():
-    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s | %(module)-10s | %(levelname)-5s | %(message)s', stream=sys.stdout)
-    engines = EngineStore()
+def main():
+    log_listener = setup_logging()
+    loop_count = int(getenv('ENGINE_LOOPS', '1'))
+    worker_count = int(getenv('ENGINE_WORKERS', '0'))
+    batch_instances = int(getenv('BATCH_INSTANCES', '0'))
+
+    if worker_count > 0:
+        host = RuntimeHost(1)
+        engines = ShardedEngineStore(worker_count, loop_count, batch_instances)
+    else:
+        host = RuntimeHost(loop_count)
+        engines = EngineStore(host, batch_instances)
+
+    idle_timeout = getenv('IDLE_TIMEOUT')
 
     try:
-        Listener(
+        host.run(Listener(
             getenv('BIND_ADDR'),
             int(getenv('BIND_PORT')),
             int(getenv('MAX_CONNS')),
-            engines
-        ).listen()
+            engines,
+            float(idle_timeout) if idle_timeout else None,
+        ).listen())
     except KeyboardInterrupt:
         logging.info('Shutdown requested')
+    finally:
+        engines.shutdown()
+        host.shutdown()
+        log_listener.stop()
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    main()
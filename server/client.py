@@ -1,20 +1,23 @@
 import asyncio
 import logging
-from socket import socket
-from threading import Thread
+from asyncio import BufferedProtocol, Transport, Queue, Event, Task
 from typing import List
 
-import bs4
-
-from engine import fb_index, EngineStore, NoSuchResourceException, AlreadyExistsException
+from engine import fb_index, EngineStore, NoSuchResourceException, AlreadyExistsException, InvalidStateException
 from engine.core import ResourceException
+from engine.deploy import Deployment
 from engine.desc import parse_ref
 from engine.fb import UnsupportedBlockException
-from .proto import RequestMessage, ResponseMessage, Request, ProtoEntity, FB, Connection
+from logs import get_tracer
+from .framing import FrameDecoder, begin_frame, end_frame
+from .proto import (RequestMessage, InvalidRequestException, ResponseMessage, Response, Request, ProtoEntity, FB, Connection,
+                    FBList, Metrics)
 
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(logger)
 MESSAGE_ENCODING = 'utf-8'
+MAX_PENDING_MESSAGES = 64
 
 
 class ClientDisconnected(Exception):
@@ -24,163 +27,337 @@ class ClientDisconnected(Exception):
         self.remote_addr = remote_addr
 
 
-class Client(Thread):
+class Client(BufferedProtocol):
     remote_addr: str
-    s: socket
     engines: EngineStore
-
-    def __init__(self, s: socket, remote_addr: str, engines: EngineStore):
-        super().__init__()
-        self.s = s
-        self.remote_addr = remote_addr
+    idle_timeout: float | None
+    clients: set['Client']
+    max_clients: int
+
+    transport: Transport | None
+    decoder: FrameDecoder
+    resource_name: str | None
+    messages: Queue[RequestMessage | None]
+    reading_paused: bool
+    writable: Event
+    task: Task | None
+    deployments: dict[str, Deployment]
+
+    def __init__(self, engines: EngineStore, idle_timeout: float | None, clients: set['Client'], max_clients: int):
+        self.remote_addr = ''
         self.engines = engines
+        self.idle_timeout = idle_timeout
+        self.clients = clients
+        self.max_clients = max_clients
+
+        self.transport = None
+        self.decoder = FrameDecoder()
+        self.resource_name = None
+        self.messages = Queue()
+        self.reading_paused = False
+        self.writable = Event()
+        self.writable.set()
+        self.task = None
+        self.deployments = {}
+
+    def connection_made(self, transport: Transport):
+        self.transport = transport
+        self.remote_addr = transport.get_extra_info('peername')
+
+        if len(self.clients) >= self.max_clients:
+            logger.warning('rejected connection from %s: %d clients already connected', self.remote_addr, len(self.clients))
+            transport.close()
+            return
+
+        logger.info('accepted connection from %s', self.remote_addr)
+        self.clients.add(self)
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    def connection_lost(self, exc: Exception | None):
+        self.messages.put_nowait(None)
+        self.writable.set()
+
+    def eof_received(self) -> bool:
+        self.messages.put_nowait(None)
+        return False
+
+    def pause_writing(self):
+        self.writable.clear()
+
+    def resume_writing(self):
+        self.writable.set()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self.decoder.get_buffer()
+
+    def buffer_updated(self, nbytes: int):
+        self.decoder.buffer_updated(nbytes)
 
-    def run(self):
-        while True:
-            try:
-                msg = self.read_request_message()
-                logger.debug('Received message for resource "%s": %s', msg.resource_name, msg.xml_payload)
-                # print(msg.resource_name, msg.xml_payload)
-                request = msg.parse_payload()
-                if not self.process_request(request):
-                    self.send_response_message(request.to_response_message())
-            except ClientDisconnected as e:
-                logger.info(f'Client {e.remote_addr} has disconnected')
-                return
-            except ResourceException as e:
-                logger.error(e.message())
-
-                if 'request' in locals():
-                    # noinspection PyUnboundLocalVariable
-                    self.send_response_message(request.to_response_message(reason=e.reason()))
-            except NoSuchResourceException as e:
-                logger.error('Client requested unknown resource %s', e.resource_name)
-
-                if 'request' in locals():
-                    # noinspection PyUnboundLocalVariable
-                    self.send_response_message(request.to_response_message(reason='UNKNOWN_RESOURCE'))
-            except AlreadyExistsException as e:
-                logger.error('Client attempted to overwrite existing resource %s', e.resource_name)
-
-                if 'request' in locals():
-                    # noinspection PyUnboundLocalVariable
-                    self.send_response_message(request.to_response_message(reason='ALREADY_EXISTS'))
-            except UnsupportedBlockException as e:
-                logger.error('Client requested unsupported block type %s', e.block_name)
-
-                if 'request' in locals():
-                    # noinspection PyUnboundLocalVariable
-                    self.send_response_message(request.to_response_message(reason='UNSUPPORTED_BLOCK'))
-            except Exception as e:
-                logger.exception(f'Error handling client connection')
-                if 'request' in locals():
-                    # noinspection PyUnboundLocalVariable
-                    self.send_response_message(request.to_response_message(reason='INTERNAL_ERROR'))
-                raise e
-
-    def process_request(self, request: Request) -> bool:
+        for frame in self.decoder.frames():
+            if self.resource_name is None:
+                self.resource_name = str(frame, MESSAGE_ENCODING)
+            else:
+                self.messages.put_nowait(RequestMessage(self.resource_name, bytes(frame)))
+                self.resource_name = None
+
+        if self.messages.qsize() >= MAX_PENDING_MESSAGES and not self.reading_paused:
+            self.transport.pause_reading()
+            self.reading_paused = True
+
+    async def run(self):
+        try:
+            while True:
+                messages = await self.read_request_messages()
+                out = bytearray()
+
+                for msg in messages:
+                    self.write_response_message(out, await self.handle_message(msg))
+
+                await self.flush(out)
+
+                if len(messages) == 0:
+                    raise ClientDisconnected(self.remote_addr)
+        except ClientDisconnected as e:
+            logger.info('Client %s has disconnected', e.remote_addr)
+        except TimeoutError:
+            logger.info('Client %s has been idle for more than %s seconds, closing', self.remote_addr, self.idle_timeout)
+        except Exception:
+            logger.exception('Error handling client connection')
+        finally:
+            self.clients.discard(self)
+            self.transport.close()
+
+    async def handle_message(self, msg: RequestMessage) -> ResponseMessage:
+        if trace.enabled:
+            logger.debug('Received message for resource "%s": %s', msg.resource_name, msg.xml_payload)
+
+        try:
+            request = msg.parse_payload()
+        except InvalidRequestException as e:
+            logger.error('Invalid request for resource "%s": %s', msg.resource_name, e.detail)
+            return ResponseMessage(Response(e.request_id if e.request_id is not None else 0, 'UNSUPPORTED_CMD'))
+        except Exception:
+            logger.exception('Cannot parse request for resource "%s"', msg.resource_name)
+            return ResponseMessage(Response(0, 'UNSUPPORTED_CMD'))
+
+        return await self.handle_request(request)
+
+    async def handle_request(self, request: Request) -> ResponseMessage:
+        try:
+            response = await self.process_request(request)
+            return response if response is not None else request.to_response_message()
+        except ResourceException as e:
+            logger.error(e.message())
+            return request.to_response_message(reason=e.reason())
+        except NoSuchResourceException as e:
+            logger.error('Client requested unknown resource %s', e.resource_name)
+            return request.to_response_message(reason='UNKNOWN_RESOURCE')
+        except AlreadyExistsException as e:
+            logger.error('Client attempted to overwrite existing resource %s', e.resource_name)
+            return request.to_response_message(reason='ALREADY_EXISTS')
+        except InvalidStateException as e:
+            logger.error('Resource %s is in invalid state for the request', e.resource_name)
+            return request.to_response_message(reason='INVALID_STATE')
+        except UnsupportedBlockException as e:
+            logger.error('Client requested unsupported block type %s', e.block_name)
+            return request.to_response_message(reason='UNSUPPORTED_BLOCK')
+        except Exception:
+            logger.exception('Error handling request %s', request.id)
+            return request.to_response_message(reason='INTERNAL_ERROR')
+
+    async def process_request(self, request: Request) -> ResponseMessage | None:
         if request.action == 'CREATE':
-            self.process_create(request.resource_name, request.payload)
-            return False
+            await self.process_create(request.resource_name, request.payload)
         elif request.action == 'WRITE':
-            self.process_write(request.resource_name, request.payload)
-            return False
+            await self.process_write(request.resource_name, request.payload)
         elif request.action == 'START':
-            self.process_start(request)
-            return True
+            await self.process_start(request.resource_name)
+        elif request.action == 'STOP':
+            await self.engines.stop_engine(request.resource_name)
+        elif request.action == 'KILL':
+            await self.engines.kill_engine(request.resource_name)
+        elif request.action == 'RESET':
+            await self.engines.reset_engine(request.resource_name)
         elif request.action == 'QUERY':
-            self.process_query(request)
-            return True
+            return await self.process_query(request)
         elif request.action == 'DELETE':
-            self.process_delete(request.payload)
-            return False
+            await self.process_delete(request.resource_name, request.payload)
         else:
             logger.error('Unknown action %s', request.action)
-            return False
 
-    def process_create(self, resource_name: str, entities: List[ProtoEntity]):
+        return None
+
+    async def process_create(self, resource_name: str, entities: List[ProtoEntity]):
         if resource_name == '':
-            self.process_create_resource(entities)
+            await self.process_create_resource(entities)
             return
 
-        engine = self.engines.get_engine(resource_name)
+        change = Deployment(self.get_deployment(resource_name).replace)
 
         for entity in entities:
             if isinstance(entity, FB):
                 fb_desc = fb_index.resolve(entity.type)
-                engine.add_fb(entity.name, fb_desc)
+                change.add_fb(entity.name, fb_desc)
             elif isinstance(entity, Connection):
-                engine.add_connection(parse_ref(entity.source), parse_ref(entity.destination))
+                change.add_connection(parse_ref(entity.source), parse_ref(entity.destination))
             else:
-                logger.error('Unsupported entity type for CREATE', type(entity).__name__)
+                logger.error('Unsupported entity type for CREATE %s', type(entity).__name__)
+
+        await self.stage(resource_name, change)
+
+    async def process_create_resource(self, entities: List[ProtoEntity]):
+        engines = self.engines.get_engines()
 
-    def process_create_resource(self, entities: List[ProtoEntity]):
         for entity in entities:
-            if isinstance(entity, FB) and entity.type == 'EMB_RES':
-                self.engines.create_engine(entity.name)
+            if isinstance(entity, FB) and entity.name in engines:
+                if engines[entity.name].resource_type != entity.type:
+                    logger.error('Resource %s is %s, cannot redeploy it as %s', entity.name,
+                                 engines[entity.name].resource_type, entity.type)
+                    raise AlreadyExistsException(entity.name)
+
+                self.deployments[entity.name] = Deployment(replace=True)
+                logger.info('Opened redeployment of resource %s', entity.name)
+            elif isinstance(entity, FB) and entity.type == 'EMB_RES':
+                await self.engines.create_engine(entity.name)
+            elif isinstance(entity, FB) and entity.type == 'BATCH_RES':
+                await self.engines.create_engine(entity.name, batched=True)
             else:
                 logger.error('Unsupported type for resource creation %s', type(entity).__name__)
 
-    def process_write(self, resource_name: str, entities: List[ProtoEntity]):
-        engine = self.engines.get_engine(resource_name)
+    async def process_write(self, resource_name: str, entities: List[ProtoEntity]):
+        change = Deployment(self.get_deployment(resource_name).replace)
 
         for entity in entities:
             if isinstance(entity, Connection):
-                engine.add_input(parse_ref(entity.destination), entity.source)
+                change.add_input(parse_ref(entity.destination), entity.source)
+            else:
+                logger.error('Unsupported entity type for WRITE %s', type(entity).__name__)
+
+        await self.stage(resource_name, change)
+
+    async def process_start(self, resource_name: str):
+        deployment = self.deployments.get(resource_name)
+        await self.commit(resource_name)
+
+        if deployment is not None and deployment.replace and await self.engines.is_running(resource_name):
+            return
+
+        await self.engines.start_engine(resource_name)
+
+    def get_deployment(self, resource_name: str) -> Deployment:
+        self.engines.get_engine(resource_name)
+
+        deployment = self.deployments.get(resource_name)
+        if deployment is None:
+            deployment = self.deployments[resource_name] = Deployment()
+
+        return deployment
+
+    async def stage(self, resource_name: str, change: Deployment):
+        deployment = self.get_deployment(resource_name)
+        await self.engines.check(resource_name, change, deployment.get_staged(change))
+
+        deployment.extend(change)
+        await self.apply_online(resource_name)
+
+    async def apply_online(self, resource_name: str):
+        if self.deployments[resource_name].replace:
+            return
+
+        if await self.engines.is_running(resource_name):
+            await self.commit(resource_name)
+
+    async def commit(self, resource_name: str):
+        deployment = self.deployments.get(resource_name)
+        if deployment is None:
+            return
+
+        try:
+            if deployment.replace:
+                await self.engines.redeploy(resource_name, deployment)
             else:
-                logger.error('Unsupported entity type for WRITE', type(entity).__name__)
+                await self.engines.commit(resource_name, deployment)
+        except Exception:
+            logger.error('Rejected deployment of %d entities to resource %s, keeping it staged', len(deployment), resource_name)
+            raise
 
-    def process_start(self, request: Request):
-        if request.resource_name not in self.engines.get_engines():
-            raise NoSuchResourceException(request.resource_name)
+        del self.deployments[resource_name]
 
-        self.send_response_message(request.to_response_message())
-        self.engines.get_engine(request.resource_name).start()
-        logger.debug('Run finished')
+    async def process_query(self, request: Request) -> ResponseMessage:
+        fb_ids = [entity.name for entity in request.payload if isinstance(entity, FB) and entity.name != '*']
+        if request.resource_name != '' and len(fb_ids) > 0:
+            return await self.process_query_metrics(request, fb_ids)
 
-    def process_query(self, request: Request):
-        list_tag = bs4.Tag(name='FBList')
+        fb_list = FBList([(name, engine.resource_type) for name, engine in self.engines.get_engines().items()])
+        return request.to_response_message(custom_payload=[fb_list])
 
-        for name in self.engines.get_engines().keys():
-            current_tag = bs4.Tag(name='FB', attrs={'name': name, 'type': 'EMB_RES'})
-            list_tag.append(current_tag)
+    async def process_query_metrics(self, request: Request, fb_ids: List[str]) -> ResponseMessage:
+        metrics = await self.engines.metrics(request.resource_name, fb_ids)
+        return request.to_response_message(custom_payload=[Metrics(metrics)])
 
-        self.send_response_message(request.to_response_message(custom_payload=[list_tag]))
+    async def process_delete(self, resource_name: str, entities: List[ProtoEntity]):
+        if resource_name != '':
+            await self.process_delete_entities(resource_name, entities)
+            return
 
-    def process_delete(self, entities: List[ProtoEntity]):
         for entity in entities:
             if isinstance(entity, FB):
-                self.engines.delete_engine(entity.name)
+                self.deployments.pop(entity.name, None)
+                await self.engines.delete_engine(entity.name)
             else:
                 logger.error('Unsupported type for resource deletion %s', type(entity).__name__)
 
-    def read_request_message(self) -> RequestMessage:
-        self.align()
-        resource_name_length = int.from_bytes(self.read_word(2), byteorder='big', signed=False)
-        resource_name = self.read_word(resource_name_length).decode(MESSAGE_ENCODING)
+    async def process_delete_entities(self, resource_name: str, entities: List[ProtoEntity]):
+        self.engines.get_engine(resource_name)
+        deployment = self.deployments.get(resource_name)
+
+        for entity in entities:
+            if isinstance(entity, FB):
+                if deployment is None or not deployment.remove_fb(entity.name):
+                    await self.engines.remove_fb(resource_name, entity.name)
+            elif isinstance(entity, Connection) and '.' in entity.source:
+                src, dst = parse_ref(entity.source), parse_ref(entity.destination)
+                if deployment is None or not deployment.remove_connection(src, dst):
+                    await self.engines.disconnect(resource_name, src, dst)
+            else:
+                logger.error('Unsupported entity type for DELETE %s', type(entity).__name__)
+
+    async def read_request_messages(self) -> List[RequestMessage]:
+        msg = await asyncio.wait_for(self.messages.get(), self.idle_timeout)
+        messages = []
+
+        while msg is not None:
+            messages.append(msg)
+            if self.messages.empty():
+                break
+            msg = self.messages.get_nowait()
 
-        self.align()
-        payload_length = int.from_bytes(self.read_word(2), byteorder='big', signed=False)
-        payload = self.read_word(payload_length).decode(MESSAGE_ENCODING)
+        if msg is None and len(messages) > 0:
+            self.messages.put_nowait(None)
 
-        return RequestMessage(resource_name, payload)
+        if self.reading_paused and self.messages.qsize() < MAX_PENDING_MESSAGES // 2:
+            self.transport.resume_reading()
+            self.reading_paused = False
 
-    def send_response_message(self, msg: ResponseMessage):
-        self.s.send(b'\x50')
-        encoded_msg = msg.xml_payload.encode(MESSAGE_ENCODING)
-        self.s.send(len(encoded_msg).to_bytes(2, byteorder='big', signed=False))
-        self.s.send(encoded_msg)
-        logger.debug('Sent message %s', str(encoded_msg))
+        return messages
 
-    def align(self):
-        while self.read_word(1) != b'\x50': pass
+    def write_response_message(self, out: bytearray, msg: ResponseMessage):
+        start = begin_frame(out)
+        msg.write_xml(out)
 
-    def read_word(self, length: int) -> bytes:
-        buf = b''
+        try:
+            end_frame(out, start)
+        except ValueError as e:
+            logger.error('Response to request %s is too large: %s', msg.response.id, e)
+            self.write_response_message(out, ResponseMessage(Response(msg.response.id, 'OVERFLOW')))
+            return
 
-        while len(buf) < length:
-            chunk = self.s.recv(length - len(buf))
-            if not chunk: raise ClientDisconnected(self.remote_addr)
-            buf += chunk
+        if trace.enabled:
+            logger.debug('Queued message %s', bytes(out[start:]))
+
+    async def flush(self, out: bytearray):
+        if len(out) == 0:
+            return
 
-        return buf
+        self.transport.write(out)
+        await self.writable.wait()
@@ -0,0 +1,88 @@
+from socket import socket
+from struct import Struct
+from typing import Iterator
+
+FRAME_TAG = 0x50
+FRAME_HEADER = Struct('>BH')
+HEADER_SIZE = FRAME_HEADER.size
+MAX_PAYLOAD_SIZE = 0xFFFF
+MAX_FRAME_SIZE = HEADER_SIZE + MAX_PAYLOAD_SIZE
+
+
+def write_frame(out: bytearray, payload: bytes):
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        raise ValueError(f'Frame payload of {len(payload)} bytes does not fit into {MAX_PAYLOAD_SIZE} bytes')
+
+    out += FRAME_HEADER.pack(FRAME_TAG, len(payload))
+    out += payload
+
+
+def begin_frame(out: bytearray) -> int:
+    start = len(out)
+    out += FRAME_HEADER.pack(FRAME_TAG, 0)
+    return start
+
+
+def end_frame(out: bytearray, start: int):
+    length = len(out) - start - HEADER_SIZE
+    if length > MAX_PAYLOAD_SIZE:
+        del out[start:]
+        raise ValueError(f'Frame payload of {length} bytes does not fit into {MAX_PAYLOAD_SIZE} bytes')
+
+    FRAME_HEADER.pack_into(out, start, FRAME_TAG, length)
+
+
+def encode_frame(payload: bytes) -> bytes:
+    out = bytearray()
+    write_frame(out, payload)
+    return bytes(out)
+
+
+class FrameDecoder:
+    buffer: bytearray
+    view: memoryview
+    start: int
+    end: int
+
+    def __init__(self, capacity: int = 2 * MAX_FRAME_SIZE):
+        self.buffer = bytearray(max(capacity, MAX_FRAME_SIZE))
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+
+    def get_buffer(self) -> memoryview:
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif len(self.buffer) - self.end < MAX_FRAME_SIZE:
+            pending = self.end - self.start
+            self.view[:pending] = self.view[self.start:self.end]
+            self.start, self.end = 0, pending
+
+        return self.view[self.end:]
+
+    def buffer_updated(self, nbytes: int):
+        self.end += nbytes
+
+    def read_from(self, s: socket) -> int:
+        nbytes = s.recv_into(self.get_buffer())
+        self.buffer_updated(nbytes)
+        return nbytes
+
+    def frames(self) -> Iterator[memoryview]:
+        while True:
+            pos = self.buffer.find(FRAME_TAG, self.start, self.end)
+            if pos < 0:
+                self.start = self.end
+                return
+
+            self.start = pos
+            if self.end - pos < HEADER_SIZE:
+                return
+
+            length = (self.buffer[pos + 1] << 8) | self.buffer[pos + 2]
+            frame_end = pos + HEADER_SIZE + length
+            if frame_end > self.end:
+                return
+
+            self.start = frame_end
+            yield self.view[pos + HEADER_SIZE:frame_end]
@@ -1,5 +1,5 @@
+import asyncio
 import logging
-from socket import socket, AF_INET, SOCK_STREAM
 
 from engine import EngineStore
 from .client import Client
@@ -10,25 +10,25 @@ class Listener:
     bind_addr: str
     port: int
     max_conns: int
+    idle_timeout: float | None
     engines: EngineStore
+    clients: set[Client]
 
-    def __init__(self, bind_addr: str, port: int, max_conns: int, engines: EngineStore):
+    def __init__(self, bind_addr: str, port: int, max_conns: int, engines: EngineStore, idle_timeout: float | None = None):
         self.bind_addr = bind_addr
         self.port = port
         self.max_conns = max_conns
+        self.idle_timeout = idle_timeout
         self.engines = engines
+        self.clients = set()
 
-    def listen(self):
-        s = socket(AF_INET, SOCK_STREAM)
-        s.bind((self.bind_addr, self.port))
-        s.listen(self.max_conns)
+    async def listen(self):
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(self.create_client, self.bind_addr, self.port, backlog=self.max_conns)
 
         logger.info(f'server is listening on {self.bind_addr}:{self.port}')
-        self.client_loop(s)
+        async with server:
+            await server.serve_forever()
 
-    def client_loop(self, s: socket):
-        while True:
-            conn, addr = s.accept()
-            logger.info(f'accepted connection from {addr}')
-            c = Client(conn, addr, self.engines)
-            c.start()
+    def create_client(self) -> Client:
+        return Client(self.engines, self.idle_timeout, self.clients, self.max_conns)
@@ -1,3 +1,3 @@
-from .request import RequestMessage, Request
-from .response import ResponseMessage, Response
+from .request import RequestMessage, Request, InvalidRequestException
+from .response import ResponseMessage, Response, ResponseEntity, FBList, Metrics
 from .models import model_index, ProtoEntity, FB, Connection
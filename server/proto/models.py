@@ -1,8 +1,8 @@
-from bs4 import Tag
+from lxml.etree import _Element
 
 
 class ProtoEntity:
-    def __init__(self, data: Tag):
+    def __init__(self, data: _Element):
         self.raw_data = data
         pass
 
@@ -11,20 +11,20 @@ class FB(ProtoEntity):
     name: str
     type: str
 
-    def __init__(self, data: Tag):
+    def __init__(self, data: _Element):
         super().__init__(data)
-        self.name = data.attrs['Name']
-        self.type = data.attrs['Type']
+        self.name = data.attrib['Name']
+        self.type = data.attrib['Type']
 
 
 class Connection(ProtoEntity):
     source: str
     destination: str
 
-    def __init__(self, data: Tag):
+    def __init__(self, data: _Element):
         super().__init__(data)
-        self.source = data.attrs['Source']
-        self.destination = data.attrs['Destination']
+        self.source = data.attrib['Source']
+        self.destination = data.attrib['Destination']
 
 
 model_index: dict[str, type[ProtoEntity]] = {
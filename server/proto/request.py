@@ -1,14 +1,26 @@
 import logging
+import re
 from typing import List
 
-import bs4
-from bs4 import BeautifulSoup
+from lxml import etree
 
-from .response import ResponseMessage, Response
+from .response import ResponseMessage, Response, ResponseEntity
 from .models import model_index, ProtoEntity
 
 
 logger = logging.getLogger(__name__)
+parser = etree.XMLParser(resolve_entities=False, no_network=True, remove_comments=True, remove_pis=True)
+REQUEST_ID = re.compile(rb'<Request\s[^>]*?\bID\s*=\s*["\']([^"\'<>]*)["\']')
+
+
+class InvalidRequestException(Exception):
+    request_id: str | None
+    detail: str
+
+    def __init__(self, request_id: str | None, detail: str):
+        super().__init__(request_id, detail)
+        self.request_id = request_id
+        self.detail = detail
 
 
 class Request:
@@ -23,34 +35,44 @@ class Request:
         self.resource_name = resource_name
         self.payload = payload
 
-    def to_response_message(self, reason = None, custom_payload: List[bs4.Tag] | None = None) -> ResponseMessage:
+    def to_response_message(self, reason = None, custom_payload: List[ResponseEntity] | None = None) -> ResponseMessage:
         return ResponseMessage.from_response(Response(self.id, reason, custom_payload))
 
 
 class RequestMessage:
     resource_name: str
-    xml_payload: str
+    xml_payload: bytes
 
-    def __init__(self, resource_name, xml_payload):
+    def __init__(self, resource_name: str, xml_payload: bytes):
         self.resource_name = resource_name
         self.xml_payload = xml_payload
 
     def parse_payload(self) -> Request:
-        document = BeautifulSoup(self.xml_payload, 'xml')
-        request = document.find(name='Request')
+        try:
+            root = etree.fromstring(self.xml_payload, parser)
+        except (etree.XMLSyntaxError, ValueError) as e:
+            match = REQUEST_ID.search(self.xml_payload)
+            raise InvalidRequestException(match.group(1).decode(errors='replace') if match else None, str(e))
 
-        request_id = request.attrs["ID"]
-        request_action = request.attrs["Action"]
-        payload = []
+        request = root if root.tag == 'Request' else root.find('.//Request')
+        if request is None:
+            raise InvalidRequestException(None, f'No Request element in {root.tag}')
+
+        request_id = request.get('ID')
+        request_action = request.get('Action')
+        if request_id is None or request_action is None:
+            raise InvalidRequestException(request_id, 'Request without ID or Action')
 
-        for child in request.children:
-            # noinspection PyUnresolvedReferences
-            model_name = child.name
+        payload = []
+        for child in request:
+            model_name = child.tag
             if model_name not in model_index:
                 logger.warning('Unknown model faced: %s', model_name)
                 continue
 
-            # noinspection PyTypeChecker
-            payload.append(model_index[model_name](child))
+            try:
+                payload.append(model_index[model_name](child))
+            except KeyError as e:
+                raise InvalidRequestException(request_id, f'{model_name} without {e.args[0]} attribute')
 
         return Request(request_id, request_action, self.resource_name, payload)
@@ -1,43 +1,132 @@
 from typing import List
 
-import bs4
+from engine.metrics import EngineMetrics, Histogram
+
+ATTR_ESCAPES = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    '\n': '&#10;',
+    '\r': '&#13;',
+    '\t': '&#9;',
+})
+MESSAGE_ENCODING = 'utf-8'
+
+
+def write_attr(out: bytearray, name: bytes, value: any):
+    out += b' '
+    out += name
+    out += b'="'
+    out += str(value).translate(ATTR_ESCAPES).encode(MESSAGE_ENCODING)
+    out += b'"'
+
+
+def write_histogram(out: bytearray, prefix: bytes, histogram: Histogram):
+    write_attr(out, prefix + b'Time', histogram.total)
+    write_attr(out, prefix + b'P50', histogram.percentile(0.5))
+    write_attr(out, prefix + b'P99', histogram.percentile(0.99))
+    write_attr(out, prefix + b'Max', histogram.max)
+    write_attr(out, prefix + b'Histogram', ' '.join(f'{bound}:{hits}' for bound, hits in histogram.bucket_counts()))
+
+
+class ResponseEntity:
+    def write_xml(self, out: bytearray):
+        raise NotImplementedError()
+
+
+class FBList(ResponseEntity):
+    fbs: List[tuple[str, str]]
+
+    def __init__(self, fbs: List[tuple[str, str]]):
+        self.fbs = fbs
+
+    def write_xml(self, out: bytearray):
+        out += b'<FBList>'
+
+        for name, fb_type in self.fbs:
+            out += b'<FB'
+            write_attr(out, b'name', name)
+            write_attr(out, b'type', fb_type)
+            out += b'/>'
+
+        out += b'</FBList>'
+
+
+class Metrics(ResponseEntity):
+    metrics: EngineMetrics
+
+    def __init__(self, metrics: EngineMetrics):
+        self.metrics = metrics
+
+    def write_xml(self, out: bytearray):
+        out += b'<Metrics>'
+
+        for stats in self.metrics.fbs:
+            out += b'<FB'
+            write_attr(out, b'Name', stats.fb_id)
+            write_attr(out, b'Type', stats.fb_type)
+            write_attr(out, b'Executions', stats.metrics.executions)
+            write_attr(out, b'Failures', stats.metrics.failures)
+            write_histogram(out, b'Exec', stats.metrics.exec_time)
+            write_histogram(out, b'Wait', stats.metrics.wait_time)
+            out += b'/>'
+
+        for stats in self.metrics.connections:
+            out += b'<Connection'
+            write_attr(out, b'Source', stats.source)
+            write_attr(out, b'Destination', stats.destination)
+            write_attr(out, b'Supplies', stats.supplies)
+            write_attr(out, b'Triggers', stats.triggers)
+            out += b'/>'
+
+        out += b'</Metrics>'
 
 
 class Response:
     id: int
     reason: str
-    custom_payload: List[bs4.Tag] | None
+    custom_payload: List[ResponseEntity] | None
 
-    def __init__(self, resp_id: int, reason: str | None = None, custom_payload: List[bs4.Tag] | None = None):
+    def __init__(self, resp_id: int, reason: str | None = None, custom_payload: List[ResponseEntity] | None = None):
         self.id = resp_id
         self.reason = reason
         self.custom_payload = custom_payload
 
-    def to_xml(self) -> str:
-        soup = bs4.BeautifulSoup('', 'xml')
-
-        attrs = {'ID': self.id}
+    def write_xml(self, out: bytearray):
+        out += b'<Response'
+        write_attr(out, b'ID', self.id)
         if self.reason is not None:
-            attrs['Reason'] = self.reason
-
-        tag = soup.new_tag('Response', attrs=attrs)
+            write_attr(out, b'Reason', self.reason)
 
-        if self.custom_payload is not None:
-            for custom_tag in self.custom_payload:
-                tag.append(custom_tag)
+        if not self.custom_payload:
+            out += b'/>'
+            return
 
-        soup.append(tag)
+        out += b'>'
+        for entity in self.custom_payload:
+            entity.write_xml(out)
+        out += b'</Response>'
 
-        res = str(soup)
-        return res[res.index('\n') + 1:]
+    def to_xml(self) -> str:
+        out = bytearray()
+        self.write_xml(out)
+        return out.decode(MESSAGE_ENCODING)
 
 
 class ResponseMessage:
-    xml_payload: str
+    response: Response
+
+    def __init__(self, response: Response):
+        self.response = response
+
+    @property
+    def xml_payload(self) -> str:
+        return self.response.to_xml()
 
-    def __init__(self, xml_payload):
-        self.xml_payload = xml_payload
+    def write_xml(self, out: bytearray):
+        self.response.write_xml(out)
 
     @staticmethod
     def from_response(response: Response):
-        return ResponseMessage(response.to_xml())
+        return ResponseMessage(response)
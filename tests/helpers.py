@@ -0,0 +1,26 @@
+import asyncio
+
+from server.client import Client
+from server.proto import RequestMessage
+
+
+class ClientSession:
+    client: Client
+    last_id: int
+
+    def __init__(self, engines):
+        self.client = Client(engines, None, set(), 1)
+        self.last_id = 0
+
+    async def request(self, resource_name: str, action: str, payload: str = '') -> str:
+        self.last_id += 1
+        xml = f'<Request ID="{self.last_id}" Action="{action}">{payload}</Request>'
+
+        response = await self.client.handle_message(RequestMessage(resource_name, xml.encode()))
+        return response.xml_payload
+
+
+async def wait_until(condition, timeout: float = 1.0):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
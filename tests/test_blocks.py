@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from engine import fb_index
+from engine.core import Engine
+from engine.desc import parse_ref
+
+
+class ConnectedValueTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = Engine()
+        self.engine.add_fb('R', fb_index.resolve('E_RESTART'))
+        self.engine.add_fb('A', fb_index.resolve('ADD_2'))
+        self.engine.add_input(parse_ref('A.IN1'), '1')
+        self.engine.add_input(parse_ref('A.IN2'), '0.5')
+        self.connect('R.WARM', 'A.REQ')
+
+    def connect(self, src: str, dst: str):
+        self.engine.add_connection(parse_ref(src), parse_ref(dst))
+
+    def value_at(self, dst: str) -> any:
+        conn = self.engine.get_inputs(parse_ref(dst))[0]
+        return self.engine.table.current[conn.slot]
+
+    def test_converters_coerce_connected_values(self):
+        for fb_id, desc in (('I', 'INT2INT'), ('B', 'BOOL2BOOL'), ('S', 'STRING2STRING'), ('T', 'STRING2STRING')):
+            self.engine.add_fb(fb_id, fb_index.resolve(desc))
+        for src, dst in (('A', 'I'), ('A', 'B'), ('A', 'S'), ('I', 'T')):
+            self.connect(f'{src}.CNF', f'{dst}.REQ')
+            self.connect(f'{src}.OUT', f'{dst}.IN')
+        self.engine.add_fb('O', fb_index.resolve('OUT_ANY_CONSOLE'))
+        for src, dst in (('I', 'IN'), ('B', 'QI'), ('S', 'LABEL'), ('T', 'IN')):
+            self.connect(f'{src}.OUT', f'O.{dst}')
+
+        asyncio.run(self.engine.run())
+
+        self.assertEqual(self.engine.failed_tasks, 0)
+        self.assertEqual(self.value_at('I.IN'), 1.5)
+        self.assertIs(type(self.value_at('T.IN')), int)
+        self.assertEqual(self.value_at('T.IN'), 1)
+        self.assertIs(self.value_at('O.QI'), True)
+        self.assertEqual(self.value_at('O.LABEL'), '1.5')
+
+    def test_arithmetic_coerces_connected_integers(self):
+        self.engine.add_fb('I', fb_index.resolve('INT2INT'))
+        self.engine.add_fb('M', fb_index.resolve('F_MAX'))
+        self.engine.add_fb('P', fb_index.resolve('ADD_2'))
+        self.connect('A.CNF', 'I.REQ')
+        self.connect('A.OUT', 'I.IN')
+        self.connect('I.CNF', 'M.REQ')
+        self.connect('I.OUT', 'M.IN1')
+        self.connect('I.OUT', 'M.IN2')
+        self.connect('M.CNF', 'P.REQ')
+        self.connect('I.OUT', 'P.IN1')
+        self.connect('I.OUT', 'P.IN2')
+        self.engine.add_fb('O', fb_index.resolve('OUT_ANY_CONSOLE'))
+        self.connect('M.OUT', 'O.IN')
+        self.connect('P.OUT', 'O.LABEL')
+
+        asyncio.run(self.engine.run())
+
+        self.assertEqual(self.engine.failed_tasks, 0)
+        self.assertIs(type(self.value_at('O.IN')), float)
+        self.assertIs(type(self.value_at('O.LABEL')), float)
+        self.assertEqual(self.value_at('O.LABEL'), 2.0)
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+
+from engine import fb_index, EngineStore, RuntimeHost
+from engine.core import Engine, NotFoundException, IncompatibleException, DuplicateException
+from engine.deploy import Deployment
+from engine.desc import parse_ref
+from tests.helpers import ClientSession
+
+
+class CheckConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = Engine()
+        self.engine.add_fb('R', fb_index.resolve('E_RESTART'))
+        self.engine.add_fb('A', fb_index.resolve('ADD_2'))
+        self.engine.add_fb('B', fb_index.resolve('ADD_2'))
+
+    def test_rejects_unknown_ports(self):
+        with self.assertRaises(NotFoundException):
+            self.engine.add_connection(parse_ref('A.NOPE'), parse_ref('B.REQ'))
+        with self.assertRaises(NotFoundException):
+            self.engine.add_connection(parse_ref('A.CNF'), parse_ref('B.BOGUS'))
+
+    def test_rejects_wrong_direction(self):
+        with self.assertRaises(NotFoundException):
+            self.engine.add_connection(parse_ref('A.REQ'), parse_ref('B.REQ'))
+        with self.assertRaises(NotFoundException):
+            self.engine.add_connection(parse_ref('A.OUT'), parse_ref('B.OUT'))
+
+    def test_rejects_event_to_data(self):
+        with self.assertRaises(IncompatibleException):
+            self.engine.add_connection(parse_ref('A.CNF'), parse_ref('B.IN1'))
+        with self.assertRaises(IncompatibleException):
+            self.engine.add_connection(parse_ref('A.OUT'), parse_ref('B.REQ'))
+
+    def test_rejects_write_to_event_input(self):
+        with self.assertRaises(IncompatibleException):
+            self.engine.add_input(parse_ref('A.REQ'), '1')
+
+    def test_commit_is_all_or_nothing(self):
+        deployment = Deployment()
+        deployment.add_fb('C', fb_index.resolve('ADD_2'))
+        deployment.add_connection(parse_ref('A.CNF'), parse_ref('C.REQ'))
+        deployment.add_connection(parse_ref('C.NOPE'), parse_ref('B.REQ'))
+
+        with self.assertRaises(NotFoundException):
+            self.engine.commit(deployment)
+
+        self.assertNotIn('C', self.engine.fb_index)
+        self.assertEqual(len(self.engine.connections), 0)
+
+    def test_check_uses_staged_fbs(self):
+        deployment = Deployment()
+        deployment.add_connection(parse_ref('A.CNF'), parse_ref('C.REQ'))
+
+        self.engine.check(deployment, {'C': fb_index.resolve('ADD_2')})
+        with self.assertRaises(NotFoundException):
+            self.engine.check(deployment, {})
+        with self.assertRaises(DuplicateException):
+            self.engine.check(self.single_fb('A'), {})
+        with self.assertRaises(DuplicateException):
+            self.engine.check(self.single_fb('C'), {'C': fb_index.resolve('ADD_2')})
+
+    @staticmethod
+    def single_fb(fb_id: str) -> Deployment:
+        deployment = Deployment()
+        deployment.add_fb(fb_id, fb_index.resolve('ADD_2'))
+        return deployment
+
+
+class StagedDeploymentTest(unittest.TestCase):
+    def setUp(self):
+        self.engines = EngineStore(RuntimeHost(1))
+        self.session = ClientSession(self.engines)
+
+    def tearDown(self):
+        self.engines.shutdown()
+
+    def test_errors_are_reported_on_the_staging_request(self):
+        asyncio.run(self.stage_invalid_entities())
+
+    async def stage_invalid_entities(self):
+        request = self.session.request
+        self.assertEqual(await request('', 'CREATE', '<FB Name="R1" Type="EMB_RES"/>'), '<Response ID="1"/>')
+        await request('R1', 'CREATE', '<FB Name="A" Type="ADD_2"/><FB Name="B" Type="REAL2REAL"/>')
+        await request('R1', 'CREATE', '<FB Name="A" Type="ADD_2"/><FB Name="B" Type="ADD_2"/>')
+
+        self.assertIn('NO_SUCH_RESOURCE', await request('R1', 'CREATE', '<Connection Source="A.NOPE" Destination="B.BOGUS"/>'))
+        self.assertIn('INVALID_OPERATION', await request('R1', 'WRITE', '<Connection Source="abc" Destination="A.IN1"/>'))
+        self.assertIn('ALREADY_EXISTS', await request('R1', 'CREATE', '<FB Name="C" Type="ADD_2"/><FB Name="A" Type="ADD_2"/>'))
+        self.assertIn('NO_SUCH_RESOURCE', await request('R1', 'WRITE', '<Connection Source="1" Destination="Z.IN1"/>'))
+
+        deployment = self.session.client.deployments['R1']
+        self.assertEqual([fb_id for fb_id, _ in deployment.fbs], ['A', 'B'])
+        self.assertEqual(len(deployment.connections) + len(deployment.inputs), 0)
+
+        self.assertEqual(await request('R1', 'START'), '<Response ID="8"/>')
+        self.assertEqual(sorted(self.engines.get_engine('R1').fb_index), ['A', 'B'])
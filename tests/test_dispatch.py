@@ -0,0 +1,120 @@
+import asyncio
+import unittest
+from asyncio import Task
+from typing import Coroutine
+
+from engine import fb_index, EngineStore, RuntimeHost
+from engine.core import Engine
+from engine.deploy import Deployment
+from engine.desc import parse_ref
+
+
+class CountingEngine(Engine):
+    spawned: int
+
+    def __init__(self):
+        super().__init__()
+        self.spawned = 0
+
+    def spawn(self, coro: Coroutine) -> Task:
+        self.spawned += 1
+        return super().spawn(coro)
+
+
+class InlineDispatchTest(unittest.TestCase):
+    CHAIN_SIZE = 500
+
+    def setUp(self):
+        self.engine = CountingEngine()
+        self.engine.add_fb('R', fb_index.resolve('E_RESTART'))
+
+    def add_chain(self, trigger: str) -> str:
+        for i in range(self.CHAIN_SIZE):
+            self.engine.add_fb(f'A{i}', fb_index.resolve('ADD_2'))
+            self.engine.add_input(parse_ref(f'A{i}.IN2'), '1')
+            if i == 0:
+                self.engine.add_input(parse_ref('A0.IN1'), '0')
+                self.engine.add_connection(parse_ref(trigger), parse_ref('A0.REQ'))
+            else:
+                self.engine.add_connection(parse_ref(f'A{i - 1}.OUT'), parse_ref(f'A{i}.IN1'))
+                self.engine.add_connection(parse_ref(f'A{i - 1}.CNF'), parse_ref(f'A{i}.REQ'))
+
+        return f'A{self.CHAIN_SIZE - 1}'
+
+    def output(self, dst: str) -> any:
+        conn = next(iter(self.engine.get_inputs(parse_ref(dst))))
+        return self.engine.table.current[conn.slot]
+
+    def test_runs_synchronous_chain_inline(self):
+        last = self.add_chain('R.WARM')
+        self.engine.add_fb('S', fb_index.resolve('ADD_2'))
+        self.engine.add_connection(parse_ref(f'{last}.OUT'), parse_ref('S.IN1'))
+
+        asyncio.run(self.engine.run())
+
+        self.assertEqual(self.output('S.IN1'), self.CHAIN_SIZE)
+        for i in range(self.CHAIN_SIZE):
+            self.assertEqual(self.engine.fb_index[f'A{i}'].metrics.executions, 1)
+        self.assertLess(self.engine.spawned, 10)
+
+    def test_spawns_blocks_that_wait(self):
+        self.engine.add_fb('D', fb_index.resolve('E_DELAY'))
+        self.engine.add_input(parse_ref('D.DT'), 'T#1ms')
+        self.engine.add_connection(parse_ref('R.WARM'), parse_ref('D.START'))
+        self.add_chain('D.EO')
+
+        asyncio.run(self.engine.run())
+
+        self.assertEqual(self.engine.fb_index['D'].metrics.executions, 1)
+        self.assertEqual(self.engine.fb_index[f'A{self.CHAIN_SIZE - 1}'].metrics.executions, 1)
+        self.assertLess(self.engine.spawned, 10)
+
+    def test_yields_during_long_runs(self):
+        asyncio.run(self.run_alongside_chain())
+
+    async def run_alongside_chain(self):
+        self.add_chain('R.WARM')
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        await self.engine.run()
+        ticker.cancel()
+
+        self.assertGreaterEqual(ticks, 5)
+
+
+class SelfTriggeringBlockTest(unittest.TestCase):
+    def setUp(self):
+        self.engines = EngineStore(RuntimeHost(1))
+
+    def tearDown(self):
+        self.engines.shutdown()
+
+    def test_kill_self_triggering_block(self):
+        asyncio.run(self.run_self_triggering_block())
+
+    async def run_self_triggering_block(self):
+        deployment = Deployment()
+        deployment.add_fb('R', fb_index.resolve('E_RESTART'))
+        deployment.add_fb('A', fb_index.resolve('ADD_2'))
+        deployment.add_connection(parse_ref('R.WARM'), parse_ref('A.REQ'))
+        deployment.add_connection(parse_ref('A.CNF'), parse_ref('A.REQ'))
+        deployment.add_input(parse_ref('A.IN1'), '1')
+        deployment.add_input(parse_ref('A.IN2'), '2')
+
+        await self.engines.create_engine('R1')
+        await self.engines.commit('R1', deployment)
+        await self.engines.start_engine('R1')
+        await asyncio.sleep(0.1)
+
+        metrics = await asyncio.wait_for(self.engines.metrics('R1', ['A']), 1.0)
+        self.assertGreater(len(metrics.fbs), 0)
+
+        await asyncio.wait_for(self.engines.kill_engine('R1'), 1.0)
+        self.assertFalse(self.engines.get_engine('R1').running)
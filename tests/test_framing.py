@@ -0,0 +1,68 @@
+import unittest
+
+from server.client import Client
+from server.framing import FrameDecoder, MAX_PAYLOAD_SIZE, MAX_FRAME_SIZE, HEADER_SIZE, encode_frame, begin_frame, end_frame
+
+
+class FrameDecoderTest(unittest.TestCase):
+    def feed(self, decoder: FrameDecoder, data: bytes, chunk_size: int) -> list[bytes]:
+        frames = []
+        for pos in range(0, len(data), chunk_size):
+            chunk = data[pos:pos + chunk_size]
+            buffer = decoder.get_buffer()
+            buffer[:len(chunk)] = chunk
+            decoder.buffer_updated(len(chunk))
+            frames.extend(bytes(frame) for frame in decoder.frames())
+
+        return frames
+
+    def test_frames_split_across_reads(self):
+        payloads = [b'R1', b'<Request ID="1" Action="START"/>', b'', b'P' * 300]
+        data = b''.join(encode_frame(payload) for payload in payloads)
+
+        for chunk_size in (1, 2, 3, 7, 64, len(data)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.feed(FrameDecoder(), data, chunk_size), payloads)
+
+    def test_max_payload_frames(self):
+        payloads = [bytes([i]) * MAX_PAYLOAD_SIZE for i in range(1, 6)]
+        data = b''.join(encode_frame(payload) for payload in payloads)
+
+        self.assertEqual(len(encode_frame(payloads[0])), MAX_FRAME_SIZE)
+        for chunk_size in (4096, MAX_FRAME_SIZE - 1, MAX_FRAME_SIZE + 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.feed(FrameDecoder(), data, chunk_size), payloads)
+
+    def test_skips_bytes_before_frame_tag(self):
+        data = b'\x00\x01' + encode_frame(b'R1')
+        self.assertEqual(self.feed(FrameDecoder(), data, 1), [b'R1'])
+
+    def test_rejects_oversized_payload(self):
+        with self.assertRaises(ValueError):
+            encode_frame(b'x' * (MAX_PAYLOAD_SIZE + 1))
+
+        out = bytearray(b'prefix')
+        start = begin_frame(out)
+        out += b'x' * (MAX_PAYLOAD_SIZE + 1)
+        with self.assertRaises(ValueError):
+            end_frame(out, start)
+        self.assertEqual(out, b'prefix')
+
+        start = begin_frame(out)
+        out += b'x' * MAX_PAYLOAD_SIZE
+        end_frame(out, start)
+        self.assertEqual(bytes(out[start:start + HEADER_SIZE]), b'\x50\xff\xff')
+
+
+class ClientFramingTest(unittest.TestCase):
+    def test_pairs_resource_and_request_frames(self):
+        client = Client(None, None, set(), 1)
+        data = encode_frame(b'R1') + encode_frame(b'<Request ID="1"/>') + encode_frame(b'') + encode_frame(b'<Request ID="2"/>')
+
+        for byte in data:
+            client.get_buffer(-1)[0] = byte
+            client.buffer_updated(1)
+
+        messages = [client.messages.get_nowait() for _ in range(client.messages.qsize())]
+        self.assertEqual([(msg.resource_name, msg.xml_payload) for msg in messages],
+                         [('R1', b'<Request ID="1"/>'), ('', b'<Request ID="2"/>')])
@@ -0,0 +1,34 @@
+import unittest
+
+from engine import fb_index
+from engine.core import Engine
+from engine.desc import parse_ref
+
+
+class RemoveFbTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = Engine()
+        self.engine.add_fb('R', fb_index.resolve('E_RESTART'))
+        self.engine.add_fb('A', fb_index.resolve('ADD_2'))
+        self.engine.add_connection(parse_ref('R.WARM'), parse_ref('A.REQ'))
+
+    def test_remove_fb_with_self_loop(self):
+        self.engine.add_connection(parse_ref('A.CNF'), parse_ref('A.REQ'))
+        self.engine.add_connection(parse_ref('A.OUT'), parse_ref('A.IN1'))
+        self.engine.add_input(parse_ref('A.IN2'), '2')
+
+        self.engine.remove_fb('A')
+
+        self.assertNotIn('A', self.engine.fb_index)
+        self.assertEqual(len(self.engine.connections), 0)
+        self.assertEqual(len(self.engine.outputs_index), 0)
+        self.assertEqual(len(self.engine.inputs_index), 0)
+
+    def test_remove_fb_keeps_other_connections(self):
+        self.engine.add_fb('B', fb_index.resolve('ADD_2'))
+        self.engine.add_connection(parse_ref('R.WARM'), parse_ref('B.REQ'))
+
+        self.engine.remove_fb('A')
+
+        self.assertEqual([(str(c.src), str(c.dst)) for c in self.engine.connections.values()],
+                         [('Ref(R.WARM)', 'Ref(B.REQ)')])
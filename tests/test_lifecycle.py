@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+
+from engine import fb_index, EngineStore, RuntimeHost
+from engine.core import InputConnection
+from engine.deploy import Deployment
+from engine.desc import parse_ref
+from tests.helpers import wait_until
+
+
+class ResetTest(unittest.TestCase):
+    def setUp(self):
+        self.engines = EngineStore(RuntimeHost(1))
+
+    def tearDown(self):
+        self.engines.shutdown()
+
+    def deploy(self, *connections: tuple[str, str], inputs: dict[str, str]) -> Deployment:
+        deployment = Deployment()
+        deployment.add_fb('R', fb_index.resolve('E_RESTART'))
+        deployment.add_fb('A', fb_index.resolve('ADD_2'))
+        deployment.add_fb('B', fb_index.resolve('ADD_2'))
+
+        for src, dst in (*connections, ('A.CNF', 'B.REQ'), ('A.OUT', 'B.IN1')):
+            deployment.add_connection(parse_ref(src), parse_ref(dst))
+        for dst, value in {'A.IN1': '1', 'A.IN2': '2', 'B.IN2': '3', **inputs}.items():
+            deployment.add_input(parse_ref(dst), value)
+
+        return deployment
+
+    def assert_clean(self):
+        engine = self.engines.get_engine('R1')
+
+        for fb in engine.fb_index.values():
+            self.assertEqual(fb.store, {}, fb.fb_id)
+            self.assertEqual(fb.contexts, {}, fb.fb_id)
+            self.assertEqual(fb.metrics.executions, 0, fb.fb_id)
+
+        for conn in engine.connections.values():
+            self.assertEqual(conn.supplies + conn.triggers, 0, str(conn))
+            if conn.slot >= 0:
+                self.assertEqual(engine.table.available[conn.slot], isinstance(conn, InputConnection), str(conn))
+
+        self.assertEqual(engine.timers.groups, {})
+        self.assertEqual(engine.table.waiters, {})
+        self.assertEqual(len(engine.pending), 0)
+
+    def test_reset_after_finishing(self):
+        asyncio.run(self.run_reset_after_finishing())
+
+    async def run_reset_after_finishing(self):
+        deployment = self.deploy(('R.WARM', 'D.START'), ('D.EO', 'A.REQ'), inputs={'D.DT': 'T#10ms'})
+        deployment.add_fb('D', fb_index.resolve('E_DELAY'))
+        engine = await self.start(deployment)
+
+        await wait_until(lambda: not engine.running)
+        self.assertEqual(engine.fb_index['B'].metrics.executions, 1)
+        data = next(conn for conn in engine.get_inputs(parse_ref('B.IN1')))
+        self.assertTrue(engine.table.available[data.slot])
+
+        await self.engines.reset_engine('R1')
+        self.assert_clean()
+
+    def test_reset_after_stop(self):
+        asyncio.run(self.run_reset_after_stop())
+
+    async def run_reset_after_stop(self):
+        deployment = self.deploy(('R.WARM', 'C.START'), ('C.EO', 'A.REQ'), inputs={'C.DT': 'T#5ms'})
+        deployment.add_fb('C', fb_index.resolve('E_CYCLE'))
+        engine = await self.start(deployment)
+
+        await wait_until(lambda: engine.fb_index['B'].metrics.executions >= 3)
+        await self.engines.stop_engine('R1')
+        await self.engines.reset_engine('R1')
+        self.assert_clean()
+
+        await self.engines.start_engine('R1')
+        await wait_until(lambda: engine.fb_index['B'].metrics.executions >= 1)
+        await self.engines.kill_engine('R1')
+
+    async def start(self, deployment: Deployment):
+        await self.engines.create_engine('R1')
+        await self.engines.commit('R1', deployment)
+        await self.engines.start_engine('R1')
+        return self.engines.get_engine('R1')
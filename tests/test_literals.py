@@ -0,0 +1,93 @@
+import unittest
+
+from engine.literals import parse_literal
+from utils import parse_duration
+
+
+class ParseLiteralTest(unittest.TestCase):
+    VALID = [
+        ('42', 'ANY', 42),
+        ('-1_000', 'ANY', -1000),
+        ('16#FF', 'ANY', 255),
+        ('2#1010', 'ANY', 10),
+        ('-8#17', 'ANY', -15),
+        ('1.5', 'ANY', 1.5),
+        ('1e3', 'ANY', 1000.0),
+        ('TRUE', 'ANY', True),
+        ('false', 'ANY', False),
+        ("'abc'", 'ANY', 'abc'),
+        ('"a$"b"', 'ANY', 'a"b'),
+        ("'line$Nnext$$'", 'ANY', 'line\nnext$'),
+        ("'$41$42'", 'ANY', 'AB'),
+        ('abc', 'ANY', 'abc'),
+        ('T#1s', 'ANY', 1.0),
+        ('INT#5', 'ANY', 5),
+        ('REAL#5', 'ANY', 5.0),
+        ('BOOL#1', 'ANY', True),
+        ('STRING#x', 'ANY', 'x'),
+        ('7', 'INT', 7),
+        ('16#7f', 'WORD', 127),
+        ('7', 'REAL', 7.0),
+        ('1_0.5', 'LREAL', 10.5),
+        ('0', 'BOOL', False),
+        ("'q'", 'STRING', 'q'),
+        ('plain', 'STRING', 'plain'),
+        ('T#x', 'STRING', 'T#x'),
+        ('T#250ms', 'TIME', 0.25),
+        ('  12  ', 'DINT', 12),
+    ]
+
+    INVALID = [
+        ('INT#1.5', 'ANY'),
+        ('16#G', 'ANY'),
+        ('16#G', 'INT'),
+        ('1.5', 'INT'),
+        ('T#1x', 'ANY'),
+        ('T#1x', 'TIME'),
+        ('abc', 'REAL'),
+        ('2', 'BOOL'),
+        ("'abc", 'ANY'),
+        ('"abc', 'STRING'),
+        ("'$4'", 'STRING'),
+        ("'$ZZ'", 'STRING'),
+    ]
+
+    def test_valid(self):
+        for text, data_type, expected in self.VALID:
+            with self.subTest(text=text, data_type=data_type):
+                value = parse_literal(text, data_type)
+                self.assertEqual(value, expected)
+                self.assertIs(type(value), type(expected))
+
+    def test_invalid(self):
+        for text, data_type in self.INVALID:
+            with self.subTest(text=text, data_type=data_type):
+                with self.assertRaises(ValueError):
+                    parse_literal(text, data_type)
+
+
+class ParseDurationTest(unittest.TestCase):
+    VALID = [
+        ('T#1s', 1.0),
+        ('t#100ms', 0.1),
+        ('TIME#1h30m', 5400.0),
+        ('LT#2d', 172800.0),
+        ('LTIME#1_000us', 1e-3),
+        ('T#1.5s', 1.5),
+        ('T#-5ms', -5e-3),
+        ('T#1m1s1ms', 61.001),
+        ('T#10ns', 1e-8),
+    ]
+
+    INVALID = ['T#1x', 'T#', '1s', 'T#s', 'X#1s', 'T#1s2', 'T#1.s']
+
+    def test_valid(self):
+        for text, expected in self.VALID:
+            with self.subTest(text=text):
+                self.assertAlmostEqual(parse_duration(text), expected)
+
+    def test_invalid(self):
+        for text in self.INVALID:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_duration(text)
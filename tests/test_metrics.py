@@ -0,0 +1,39 @@
+import asyncio
+import unittest
+
+from lxml import etree
+
+from engine import EngineStore, RuntimeHost
+from tests.helpers import ClientSession, wait_until
+
+
+class FailureMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.engines = EngineStore(RuntimeHost(1))
+        self.session = ClientSession(self.engines)
+
+    def tearDown(self):
+        self.engines.shutdown()
+
+    def test_reports_failures_per_fb(self):
+        asyncio.run(self.run_failing_division())
+
+    async def run_failing_division(self):
+        request = self.session.request
+        await request('', 'CREATE', '<FB Name="R1" Type="EMB_RES"/>')
+        await request('R1', 'CREATE', '<FB Name="R" Type="E_RESTART"/><FB Name="D" Type="F_DIV"/><FB Name="A" Type="ADD_2"/>'
+                                      '<Connection Source="R.WARM" Destination="D.REQ"/>'
+                                      '<Connection Source="R.WARM" Destination="A.REQ"/>')
+        await request('R1', 'WRITE', '<Connection Source="1" Destination="D.IN1"/><Connection Source="0" Destination="D.IN2"/>'
+                                     '<Connection Source="1" Destination="A.IN1"/><Connection Source="2" Destination="A.IN2"/>')
+        await request('R1', 'START')
+
+        engine = self.engines.get_engine('R1')
+        await wait_until(lambda: not engine.running)
+        self.assertEqual(engine.failed_tasks, 1)
+
+        response = await request('R1', 'QUERY', '<FB Name="D" Type="*"/><FB Name="A" Type="*"/>')
+        metrics = etree.fromstring(response).find('Metrics')
+        fbs = {fb.get('Name'): fb for fb in metrics.iterfind('FB')}
+        self.assertEqual((fbs['D'].get('Executions'), fbs['D'].get('Failures')), ('1', '1'))
+        self.assertEqual((fbs['A'].get('Executions'), fbs['A'].get('Failures')), ('1', '0'))
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+
+from engine import EngineStore, RuntimeHost
+from engine.desc import parse_ref
+from tests.helpers import ClientSession, wait_until
+
+
+class OnlineChangeTest(unittest.TestCase):
+    def setUp(self):
+        self.engines = EngineStore(RuntimeHost(1))
+        self.session = ClientSession(self.engines)
+
+    def tearDown(self):
+        self.engines.shutdown()
+
+    async def start(self):
+        request = self.session.request
+        await request('', 'CREATE', '<FB Name="R1" Type="EMB_RES"/>')
+        await request('R1', 'CREATE', '<FB Name="R" Type="E_RESTART"/><FB Name="C" Type="E_CYCLE"/>'
+                                      '<FB Name="D" Type="E_DELAY"/><FB Name="A" Type="ADD_2"/>')
+        await request('R1', 'CREATE', '<Connection Source="R.WARM" Destination="C.START"/>'
+                                      '<Connection Source="R.WARM" Destination="D.START"/>'
+                                      '<Connection Source="D.EO" Destination="A.REQ"/>')
+        await request('R1', 'WRITE', '<Connection Source="T#20ms" Destination="C.DT"/>'
+                                     '<Connection Source="T#200ms" Destination="D.DT"/>')
+        await request('R1', 'START')
+
+        engine = self.engines.get_engine('R1')
+        await wait_until(lambda: engine.timers.active == 2)
+        return engine
+
+    def test_create_is_atomic(self):
+        asyncio.run(self.create_online())
+
+    async def create_online(self):
+        engine = await self.start()
+        request = self.session.request
+
+        response = await request('R1', 'CREATE', '<FB Name="X" Type="ADD_2"/>'
+                                                 '<Connection Source="C.EO" Destination="X.REQ"/>'
+                                                 '<Connection Source="C.EO" Destination="X.NOPE"/>')
+        self.assertIn('NO_SUCH_RESOURCE', response)
+        self.assertNotIn('X', engine.fb_index)
+        self.assertEqual(len(engine.connections), 5)
+
+        response = await request('R1', 'CREATE', '<FB Name="X" Type="ADD_2"/>'
+                                                 '<Connection Source="C.EO" Destination="X.REQ"/>')
+        self.assertNotIn('Reason', response)
+        await wait_until(lambda: engine.fb_index['X'].metrics.executions >= 1)
+
+    def test_write_changes_value(self):
+        asyncio.run(self.write_online())
+
+    async def write_online(self):
+        engine = await self.start()
+
+        self.assertNotIn('Reason', await self.session.request('R1', 'WRITE', '<Connection Source="5" Destination="A.IN1"/>'))
+        self.assertTrue(engine.has_input(parse_ref('A.IN1'), 5.0))
+
+        await self.session.request('R1', 'WRITE', '<Connection Source="7" Destination="A.IN1"/>')
+        self.assertTrue(engine.has_input(parse_ref('A.IN1'), 7.0))
+
+    def test_delete_cancels_pending_timer(self):
+        asyncio.run(self.delete_online())
+
+    async def delete_online(self):
+        engine = await self.start()
+
+        self.assertNotIn('Reason', await self.session.request('R1', 'DELETE', '<FB Name="D" Type="E_DELAY"/>'))
+        self.assertNotIn('D', engine.fb_index)
+        self.assertEqual(engine.timers.active, 1)
+
+        await asyncio.sleep(0.3)
+        self.assertEqual(engine.fb_index['A'].metrics.executions, 0)
+        self.assertTrue(engine.running)
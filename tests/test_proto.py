@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+
+from lxml import etree
+
+from engine import EngineStore, RuntimeHost
+from engine.metrics import EngineMetrics
+from server.client import Client
+from server.framing import FrameDecoder
+from server.proto import RequestMessage, InvalidRequestException, Response, ResponseMessage, FBList, Metrics, FB, Connection
+from tests.helpers import ClientSession
+
+
+class RequestParsingTest(unittest.TestCase):
+    def parse(self, xml: bytes):
+        return RequestMessage('R1', xml).parse_payload()
+
+    def test_parses_entities(self):
+        request = self.parse(b'<?xml version="1.0"?><Request ID="3" Action="CREATE"><FB Name="A" Type="ADD_2"/>'
+                             b'<Unknown/><Connection Source="A.CNF" Destination="B.REQ"/></Request>')
+
+        self.assertEqual((request.id, request.action, request.resource_name), ('3', 'CREATE', 'R1'))
+        self.assertEqual([type(entity) for entity in request.payload], [FB, Connection])
+        self.assertEqual((request.payload[0].name, request.payload[0].type), ('A', 'ADD_2'))
+        self.assertEqual((request.payload[1].source, request.payload[1].destination), ('A.CNF', 'B.REQ'))
+
+    def test_rejects_invalid_requests(self):
+        cases = [
+            (b'<Request ID="5" Action="CREATE"><FB Name="A"</Request>', '5'),
+            (b"<Request Action='WRITE' ID='6'><Connection", '6'),
+            (b'<Request ID="7" Action="CREATE"><FB Name="A"/></Request>', '7'),
+            (b'<Request ID="8"/>', '8'),
+            (b'<Other/>', None),
+            (b'not xml', None),
+            (b'', None),
+        ]
+
+        for xml, request_id in cases:
+            with self.subTest(xml=xml):
+                with self.assertRaises(InvalidRequestException) as raised:
+                    self.parse(xml)
+                self.assertEqual(raised.exception.request_id, request_id)
+
+    def test_answers_malformed_request_with_its_id(self):
+        session = ClientSession(EngineStore(RuntimeHost(1)))
+        try:
+            response = asyncio.run(session.client.handle_message(RequestMessage('', b'<Request ID="5" Action="QUERY"><FB')))
+            self.assertEqual(response.xml_payload, '<Response ID="5" Reason="UNSUPPORTED_CMD"/>')
+        finally:
+            session.client.engines.shutdown()
+
+
+class ResponseXmlTest(unittest.TestCase):
+    # Output of the BeautifulSoup serializer these responses used to go through
+    PREVIOUS = [
+        (Response(1), '<Response ID="1"/>'),
+        (Response('7', 'NO_SUCH_RESOURCE'), '<Response ID="7" Reason="NO_SUCH_RESOURCE"/>'),
+        (Response(3, custom_payload=[FBList([('R1', 'EMB_RES'), ('a<&"b', 'EMB_RES')])]),
+         '<Response ID="3"><FBList><FB name="R1" type="EMB_RES"></FB><FB name=\'a&lt;&amp;"b\' type="EMB_RES"></FB></FBList></Response>'),
+        (Response(4, custom_payload=[FBList([])]), '<Response ID="4"><FBList></FBList></Response>'),
+        (Response('x"y'), '<Response ID=\'x"y\'/>'),
+    ]
+
+    def test_matches_previous_serializer(self):
+        for response, previous in self.PREVIOUS:
+            with self.subTest(previous=previous):
+                self.assertEqual(self.canonical(response.to_xml()), self.canonical(previous))
+
+    def test_plain_responses_are_unchanged(self):
+        for response, previous in self.PREVIOUS[:2]:
+            self.assertEqual(response.to_xml(), previous)
+
+    def test_escapes_attributes(self):
+        xml = Response(1, 'a\n\tb').to_xml()
+        self.assertEqual(etree.fromstring(xml).get('Reason'), 'a\n\tb')
+
+    def test_empty_metrics(self):
+        self.assertEqual(Response(2, custom_payload=[Metrics(EngineMetrics([], []))]).to_xml(),
+                         '<Response ID="2"><Metrics></Metrics></Response>')
+
+    @staticmethod
+    def canonical(xml: str) -> bytes:
+        return etree.tostring(etree.fromstring(xml), method='c14n')
+
+
+class OverflowTest(unittest.TestCase):
+    def test_replaces_oversized_response(self):
+        client = Client(None, None, set(), 1)
+        fbs = FBList([(f'RESOURCE_{i}', 'EMB_RES') for i in range(3000)])
+
+        out = bytearray()
+        client.write_response_message(out, ResponseMessage(Response(1)))
+        client.write_response_message(out, ResponseMessage(Response(9, custom_payload=[fbs])))
+        client.write_response_message(out, ResponseMessage(Response(10)))
+
+        decoder = FrameDecoder()
+        decoder.get_buffer()[:len(out)] = out
+        decoder.buffer_updated(len(out))
+        self.assertEqual([bytes(frame) for frame in decoder.frames()],
+                         [b'<Response ID="1"/>', b'<Response ID="9" Reason="OVERFLOW"/>', b'<Response ID="10"/>'])
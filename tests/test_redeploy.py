@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+
+from engine import fb_index, EngineStore, RuntimeHost
+from engine.core import Engine, NotFoundException
+from engine.deploy import Deployment
+from engine.desc import parse_ref
+from tests.helpers import ClientSession
+
+
+class RedeployTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = Engine()
+        self.engine.add_fb('A', fb_index.resolve('ADD_2'))
+        self.engine.add_fb('B', fb_index.resolve('ADD_2'))
+        self.engine.add_connection(parse_ref('A.CNF'), parse_ref('B.REQ'))
+        self.engine.add_connection(parse_ref('B.CNF'), parse_ref('B.REQ'))
+        self.engine.add_input(parse_ref('A.IN1'), '1')
+
+    def test_removes_self_loop_fb(self):
+        deployment = Deployment(replace=True)
+        deployment.add_fb('A', fb_index.resolve('ADD_2'))
+
+        self.engine.redeploy(deployment)
+
+        self.assertEqual(list(self.engine.fb_index), ['A'])
+        self.assertEqual(len(self.engine.connections), 0)
+
+    def test_failed_redeploy_keeps_graph(self):
+        graph = self.snapshot()
+
+        deployment = Deployment(replace=True)
+        deployment.add_fb('A', fb_index.resolve('ADD_2'))
+        deployment.add_fb('C', fb_index.resolve('ADD_2'))
+        deployment.add_connection(parse_ref('A.CNF'), parse_ref('C.REQ'))
+        deployment.add_connection(parse_ref('B.CNF'), parse_ref('C.REQ'))
+
+        with self.assertRaises(NotFoundException):
+            self.engine.redeploy(deployment)
+
+        self.assertEqual(self.snapshot(), graph)
+
+    def snapshot(self) -> tuple:
+        fbs = {fb_id: fb.desc.name for fb_id, fb in self.engine.fb_index.items()}
+        connections = sorted((repr(conn.src), repr(conn.dst)) for conn in self.engine.connections.values())
+        return fbs, connections
+
+
+class RedeployResourceTest(unittest.TestCase):
+    def setUp(self):
+        self.engines = EngineStore(RuntimeHost(1))
+        self.session = ClientSession(self.engines)
+
+    def tearDown(self):
+        self.engines.shutdown()
+
+    def test_rejects_resource_type_change(self):
+        asyncio.run(self.recreate_resource())
+
+    async def recreate_resource(self):
+        request = self.session.request
+        await request('', 'CREATE', '<FB Name="R1" Type="EMB_RES"/>')
+
+        self.assertIn('ALREADY_EXISTS', await request('', 'CREATE', '<FB Name="R1" Type="BATCH_RES"/>'))
+        self.assertNotIn('R1', self.session.client.deployments)
+
+        self.assertEqual(await request('', 'CREATE', '<FB Name="R1" Type="EMB_RES"/>'), '<Response ID="3"/>')
+        self.assertTrue(self.session.client.deployments['R1'].replace)
@@ -0,0 +1,34 @@
+import asyncio
+import unittest
+
+from engine import ShardedEngineStore
+from tests.helpers import ClientSession
+
+
+class ShardedRunningStateTest(unittest.TestCase):
+    def setUp(self):
+        self.engines = ShardedEngineStore(1)
+        self.session = ClientSession(self.engines)
+
+    def tearDown(self):
+        self.engines.shutdown()
+
+    def test_finished_engine_is_not_running(self):
+        asyncio.run(self.run_finished_engine())
+
+    async def run_finished_engine(self):
+        request = self.session.request
+        await request('', 'CREATE', '<FB Name="R1" Type="EMB_RES"/>')
+        await request('R1', 'CREATE', '<FB Name="R" Type="E_RESTART"/><FB Name="A" Type="ADD_2"/>')
+        await request('R1', 'CREATE', '<Connection Source="R.WARM" Destination="A.REQ"/>')
+        self.assertEqual(await request('R1', 'START'), '<Response ID="4"/>')
+
+        async with asyncio.timeout(2.0):
+            while await self.engines.is_running('R1'):
+                await asyncio.sleep(0.01)
+
+        self.assertEqual(await request('R1', 'CREATE', '<FB Name="B" Type="ADD_2"/>'), '<Response ID="5"/>')
+        self.assertIn('B', self.session.client.deployments['R1'].descs)
+
+        self.assertEqual(await request('R1', 'START'), '<Response ID="6"/>')
+        self.assertNotIn('R1', self.session.client.deployments)
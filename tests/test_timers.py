@@ -0,0 +1,43 @@
+import asyncio
+import unittest
+
+from engine.timers import TimerService
+
+
+class CallEveryTest(unittest.TestCase):
+    def test_late_member_waits_a_full_period(self):
+        asyncio.run(self.run_late_member())
+
+    async def run_late_member(self):
+        loop = asyncio.get_running_loop()
+        timers = TimerService()
+        fired = {'first': [], 'second': []}
+
+        started = loop.time()
+        timers.call_every(0.1, lambda: fired['first'].append(loop.time()))
+        await asyncio.sleep(0.06)
+
+        joined = loop.time()
+        timers.call_every(0.1, lambda: fired['second'].append(loop.time()))
+        await asyncio.sleep(0.25)
+        timers.clear()
+
+        self.assertGreaterEqual(fired['first'][0] - started, 0.1)
+        self.assertGreaterEqual(fired['second'][0] - joined, 0.1)
+        self.assertEqual(len(timers.groups), 0)
+
+    def test_same_phase_members_share_a_group(self):
+        asyncio.run(self.run_same_phase())
+
+    async def run_same_phase(self):
+        timers = TimerService()
+        first = timers.call_every(0.1, lambda: None)
+        second = timers.call_every(0.1, lambda: None)
+
+        self.assertIs(first.group, second.group)
+        self.assertEqual(len(timers.groups), 1)
+
+        first.cancel()
+        second.cancel()
+        self.assertEqual(len(timers.groups), 0)
+        self.assertTrue(timers.idle.is_set())
@@ -1,2 +1,31 @@
-def parse_duration(input_str: str) -> int:
-    return int(input_str.split('#')[1].rstrip('s'))
+import re
+
+TIME_LITERAL = re.compile(r'^(?:L?TIME|L?T)#(-)?((?:\d+(?:\.\d+)?(?:d|h|ms|m|s|us|ns))+)$', re.IGNORECASE)
+TIME_COMPONENT = re.compile(r'(\d+(?:\.\d+)?)(d|h|ms|m|s|us|ns)', re.IGNORECASE)
+TIME_UNITS = {
+    'd': 86400.0,
+    'h': 3600.0,
+    'm': 60.0,
+    's': 1.0,
+    'ms': 1e-3,
+    'us': 1e-6,
+    'ns': 1e-9,
+}
+
+
+def parse_duration(input_str: str) -> float:
+    match = TIME_LITERAL.match(input_str.strip().replace('_', ''))
+    if match is None:
+        raise ValueError(f'Invalid TIME literal {input_str!r}')
+
+    sign, body = match.groups()
+    seconds = sum(float(value) * TIME_UNITS[unit.lower()] for value, unit in TIME_COMPONENT.findall(body))
+
+    return -seconds if sign else seconds
+
+
+def duration(value: any) -> float:
+    if isinstance(value, str):
+        return parse_duration(value)
+
+    return float(value)